@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+Accuracy and speed harness for the Oxford 3000 parsers.
+Runs every parser, records wall time, peak memory and page throughput,
+scores the output against a golden list and writes a JSON report.
+With --baseline, a recall drop or a slowdown past the tolerance exits
+non-zero, so CI can fail on either. Speed is judged relative to
+parse_oxford_final timed in the same run, so a slower machine or a
+noisy CI runner doesn't count as a regression.
+"""
+
+import argparse
+import contextlib
+import csv
+import importlib
+import io
+import json
+import os
+import re
+import sys
+import time
+import tracemalloc
+
+from pdf_pages import invalidate_cache, load_pages, page_count, pdf_sha256
+
+PDF_PATH = 'The_Oxford_3000.pdf'
+REPORT_PATH = 'oxford_parser_report.json'
+
+# Golden list: the hardcoded text in parse_oxford_pdf (regenerated with
+# --write-golden) plus hand-checked entries from later pages, marked 'manual'
+GOLDEN_PATH = 'fixtures/oxford3000_golden.csv'
+GOLDEN_FIELDS = ['word', 'pos', 'level', 'source']
+GOLDEN_TEXT_SOURCE = 'parse_oxford_pdf_text'
+BASELINE_PATH = 'fixtures/oxford_parser_baseline.json'
+
+# (module, function, reads the PDF); parse_oxford_pdf parses its own hardcoded text
+PARSERS = [
+    ('parse_oxford_pdf', 'parse_oxford_pdf_text', False),
+    ('parse_oxford_pdf_full', 'parse_pdf_with_pdfplumber', True),
+    ('parse_oxford_final', 'parse_multicolumn_format', True),
+    ('parse_oxford_comprehensive', 'parse_comprehensive', True),
+    ('parse_oxford_layout', 'parse_layout', True),
+]
+RECALL_METRICS = ['word_recall', 'level_recall', 'triple_recall']
+
+REPEATS = 3
+# Any recall drop fails; a parser's wall time divided by SPEED_REFERENCE's
+# from the same run may grow by SPEED_TOLERANCE x before it counts as a
+# regression. Absolute wall times are reported but never checked.
+RECALL_TOLERANCE = 0.0
+SPEED_REFERENCE = 'parse_oxford_final'
+SPEED_TOLERANCE = 2.0
+
+# The hardcoded text is read with its own line parser against this closed
+# list of parts of speech (longest first), never with a parser being scored,
+# so a tokenizer bug can't be copied into the expected values
+GOLDEN_POS = ['indefinite article', 'definite article', 'infinitive marker', 'auxiliary v.', 'modal v.',
+              'exclam.', 'number', 'prep.', 'pron.', 'conj.', 'adj.', 'adv.', 'det.', 'n.', 'v.']
+GOLDEN_TOKEN_PATTERN = re.compile(r'(?<![a-z])(' + '|'.join(map(re.escape, GOLDEN_POS)) + r')|([AB][12])')
+
+SENSE_PATTERN = re.compile(r'\([^)]*\)')
+HOMOGRAPH_PATTERN = re.compile(r'(?<=[a-z])\d$')
+
+def normalize_word(word):
+    """Compare headwords without case, sense notes or homograph numbers: "Bank (money)" -> "bank" """
+    word = SENSE_PATTERN.sub(' ', word.lower())
+    return HOMOGRAPH_PATTERN.sub('', ' '.join(word.split()))
+
+def parse_golden_line(line):
+    """
+    (word, [(pos, level), ...]) of one "word pos, pos LEVEL, pos LEVEL" line:
+    "account n. B1, v. B2" -> ("account", [("n.", "B1"), ("v.", "B2")]).
+    The headword is everything before the first part of speech after its first word.
+    """
+    line = line.strip()
+    first = GOLDEN_TOKEN_PATTERN.search(line, line.find(' ') + 1)
+    if first is None:
+        return line, []
+
+    pairs, pending = [], []
+    for pos, level in GOLDEN_TOKEN_PATTERN.findall(line, first.start()):
+        if pos:
+            pending.append(pos)
+        else:
+            pairs.extend((name, level) for name in pending)
+            pending = []
+    return line[:first.start()].strip(), pairs
+
+def write_golden(golden_path=GOLDEN_PATH):
+    """Regenerate the rows taken from parse_oxford_pdf's hardcoded text, keeping the manual rows"""
+    from parse_oxford_pdf import OXFORD_PDF_TEXT
+
+    rows = []
+    for line in OXFORD_PDF_TEXT.strip().split('\n'):
+        if not line.strip():
+            continue
+        word, pairs = parse_golden_line(line)
+        rows.extend({'word': word, 'pos': pos, 'level': level, 'source': GOLDEN_TEXT_SOURCE}
+                    for pos, level in pairs)
+
+    if os.path.exists(golden_path):
+        with open(golden_path, newline='', encoding='utf-8') as f:
+            rows.extend(row for row in csv.DictReader(f) if row['source'] != GOLDEN_TEXT_SOURCE)
+
+    os.makedirs(os.path.dirname(golden_path) or '.', exist_ok=True)
+    with open(golden_path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=GOLDEN_FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+    print(f"✅ Wrote {len(rows)} golden rows to {golden_path}")
+
+def load_golden(golden_path=GOLDEN_PATH):
+    """(word -> first level, {(word, pos, level)}) from the golden CSV"""
+    levels = {}
+    triples = set()
+    with open(golden_path, newline='', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            word = normalize_word(row['word'])
+            levels.setdefault(word, row['level'])
+            triples.add((word, row['pos'], row['level']))
+    return levels, triples
+
+def score(items, golden_levels, golden_triples):
+    """Recall of golden words, of golden words with the right (first) level, and of golden triples"""
+    levels = {}
+    for item in items:
+        levels.setdefault(normalize_word(item['word']), item['level'])
+    found = [word for word in golden_levels if word in levels]
+    correct = sum(levels[word] == golden_levels[word] for word in found)
+
+    triple_recall = None
+    if items and 'pos' in items[0]:
+        triples = {(normalize_word(item['word']), item['pos'], item['level']) for item in items}
+        triple_recall = len(golden_triples & triples) / max(len(golden_triples), 1)
+
+    return {
+        'words': len(levels),
+        'word_recall': len(found) / max(len(golden_levels), 1),
+        'level_recall': correct / max(len(golden_levels), 1),
+        'triple_recall': triple_recall,
+    }
+
+def run_parser(parse, args, repeats, cold, pdf_path):
+    """Best wall time over repeats, then one more run under tracemalloc for the peak"""
+    timings = []
+    for _ in range(repeats):
+        if cold:
+            invalidate_cache(pdf_path)
+        with contextlib.redirect_stdout(io.StringIO()):
+            started = time.perf_counter()
+            items = parse(*args)
+            timings.append(time.perf_counter() - started)
+
+    if cold:
+        invalidate_cache(pdf_path)
+    tracemalloc.start()
+    with contextlib.redirect_stdout(io.StringIO()):
+        parse(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return items, min(timings), peak / (1024 * 1024)
+
+def relative_time(report, result):
+    """result's wall time as a multiple of SPEED_REFERENCE's in the same report, None without it"""
+    reference = report['parsers'].get(SPEED_REFERENCE)
+    if reference is None:
+        return None
+    return round(result['wall_time_s'] / max(reference['wall_time_s'], 1e-9), 3)
+
+def benchmark_parsers(pdf_path=PDF_PATH, golden_path=GOLDEN_PATH, repeats=REPEATS, cold=False):
+    golden_levels, golden_triples = load_golden(golden_path)
+    pages = page_count(pdf_path)
+    if not cold:
+        with contextlib.redirect_stdout(io.StringIO()):
+            load_pages(pdf_path)
+
+    report = {
+        'pdf': pdf_path,
+        'pdf_sha256': pdf_sha256(pdf_path),
+        'pages': pages,
+        'cache': 'cold' if cold else 'warm',
+        'repeats': repeats,
+        'golden': {'path': golden_path, 'words': len(golden_levels), 'triples': len(golden_triples)},
+        'parsers': {},
+    }
+
+    print(f"\n📏 Benchmarking Oxford parsers on {pdf_path} ({report['cache']} cache, best of {repeats})")
+    print(f"  Golden list: {len(golden_levels)} words, {len(golden_triples)} triples ({golden_path})")
+    print(f"  {'parser':<28} {'time':>9} {'peak':>8} {'pages/s':>8} {'words':>6} "
+          f"{'recall':>7} {'level':>7} {'triples':>8}")
+
+    for module_name, function_name, reads_pdf in PARSERS:
+        parse = getattr(importlib.import_module(module_name), function_name)
+        args = (pdf_path,) if reads_pdf else ()
+        items, elapsed, peak_mb = run_parser(parse, args, repeats, cold and reads_pdf, pdf_path)
+
+        result = {
+            'wall_time_s': round(elapsed, 6),
+            'peak_memory_mb': round(peak_mb, 3),
+            'pages_per_s': round(pages / max(elapsed, 1e-9), 1) if reads_pdf else None,
+        }
+        result.update(score(items, golden_levels, golden_triples))
+        report['parsers'][module_name] = result
+
+        pages_per_s = f"{result['pages_per_s']:8.1f}" if reads_pdf else f"{'-':>8}"
+        triple_recall = (f"{result['triple_recall'] * 100:7.1f}%" if result['triple_recall'] is not None
+                         else f"{'-':>8}")
+        print(f"  {module_name:<28} {elapsed * 1000:7.1f}ms {peak_mb:6.1f}MB {pages_per_s} "
+              f"{result['words']:6d} {result['word_recall'] * 100:6.1f}% {result['level_recall'] * 100:6.1f}% "
+              f"{triple_recall}")
+
+    for result in report['parsers'].values():
+        result['relative_time'] = relative_time(report, result)
+    return report
+
+def check_baseline(report, baseline):
+    """
+    Regression messages for recall drops and slowdowns against a baseline report.
+    Speed is each parser's wall time relative to SPEED_REFERENCE in its own
+    run, and only compared when both runs used the same cache mode.
+    """
+    failures = []
+    compare_speed = baseline.get('cache') == report['cache']
+    if not compare_speed:
+        print(f"⚠️  Baseline used a {baseline.get('cache')} cache, this run {report['cache']}: skipping speed checks")
+    elif SPEED_REFERENCE not in report['parsers'] or SPEED_REFERENCE not in baseline['parsers']:
+        print(f"⚠️  {SPEED_REFERENCE} missing from the baseline or this run: skipping speed checks")
+        compare_speed = False
+    for name, expected in baseline['parsers'].items():
+        actual = report['parsers'].get(name)
+        if actual is None:
+            failures.append(f"{name}: missing from this run")
+            continue
+        for metric in RECALL_METRICS:
+            if expected.get(metric) is None:
+                continue
+            if actual.get(metric) is None or actual[metric] < expected[metric] - RECALL_TOLERANCE:
+                failures.append(f"{name}: {metric} {actual.get(metric)} < baseline {expected[metric]}")
+        if not compare_speed or name == SPEED_REFERENCE:
+            continue
+        actual_relative, expected_relative = relative_time(report, actual), relative_time(baseline, expected)
+        if actual_relative > expected_relative * SPEED_TOLERANCE:
+            failures.append(f"{name}: {actual_relative:.2f}x {SPEED_REFERENCE}'s time > "
+                            f"{expected_relative * SPEED_TOLERANCE:.2f}x (baseline {expected_relative:.2f}x)")
+    return failures
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Score and time every Oxford 3000 parser against a golden list')
+    parser.add_argument('pdf_path', nargs='?', default=PDF_PATH,
+                        help=f'PDF to parse (default: {PDF_PATH})')
+    parser.add_argument('--golden', default=GOLDEN_PATH,
+                        help=f'Golden CSV of word, pos, level, source rows (default: {GOLDEN_PATH})')
+    parser.add_argument('--report', default=REPORT_PATH,
+                        help=f'JSON report to write (default: {REPORT_PATH})')
+    parser.add_argument('--repeats', type=int, default=REPEATS,
+                        help=f'Timed runs per parser, best one is kept (default: {REPEATS})')
+    parser.add_argument('--cold', action='store_true',
+                        help='Drop the page cache before every run, so PDF extraction is timed too')
+    parser.add_argument('--baseline', nargs='?', const=BASELINE_PATH, default=None,
+                        help=f'Fail on regressions against this report (default: {BASELINE_PATH})')
+    parser.add_argument('--write-baseline', action='store_true',
+                        help=f'Save this run as {BASELINE_PATH}')
+    parser.add_argument('--write-golden', action='store_true',
+                        help="Regenerate the golden rows from parse_oxford_pdf's text and exit")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    if args.write_golden:
+        write_golden(args.golden)
+        return 0
+
+    report = benchmark_parsers(args.pdf_path, args.golden, args.repeats, args.cold)
+    with open(args.report, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"\n✅ Report written to {args.report}")
+
+    if args.write_baseline:
+        with open(BASELINE_PATH, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"✅ Baseline written to {BASELINE_PATH}")
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            failures = check_baseline(report, json.load(f))
+        if failures:
+            print(f"\n❌ {len(failures)} regression(s) against {args.baseline}:")
+            for failure in failures:
+                print(f"  {failure}")
+            return 1
+        print(f"✅ No regressions against {args.baseline}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -6,13 +6,273 @@ Creates two databases:
 2. sentences.db - Turkish-English sentence pairs
 """
 
+import argparse
+import hashlib
+import json
 import sqlite3
 import csv
 import os
+import re
+import secrets
+import time
+from datetime import datetime, timezone
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from sentence_compression import ZSTD_DB_PATH, benchmark_zstd_database, create_zstd_database
+
+TSV_FILENAME = 'Türkçe-İngilizce dillerindeki cümle eşleri - 2025-11-10.tsv'
+VOCABULARY_CSV = 'vocabulary_with_levels.csv'
+# Every (word, pos, level) triple from parse_oxford_layout.py
+POS_LEVELS_CSV = 'oxford3000_word_pos_levels.csv'
+
+# Connection settings used by --bulk-load
+BULK_LOAD_PRAGMAS = [
+    'PRAGMA journal_mode = OFF',
+    'PRAGMA synchronous = OFF',
+    'PRAGMA cache_size = -262144',  # 256 MB page cache
+    'PRAGMA temp_store = MEMORY',
+    'PRAGMA locking_mode = EXCLUSIVE',
+]
+
+# unicode61 folds ASCII case and, with remove_diacritics 2, ş/ç/ğ/ö/ü/İ to
+# s/c/g/o/u/i, but it keeps dotless ı as its own letter and lowercases I to i:
+# on turkish_text alone 'sarki' misses 'şarkı' and 'ışık' misses a
+# sentence-initial 'Işık'. The Turkish side is therefore indexed from a
+# virtual (unstored) column with ı folded to i, so I/ı/İ/i all match each
+# other; queries must get the same fold (fold_search_text).
+TURKISH_SEARCH_SQL = "replace(turkish_text, 'ı', 'i')"
+
+SENTENCES_SCHEMA = f'''
+    CREATE TABLE sentences (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        turkish_id INTEGER,
+        turkish_text TEXT NOT NULL,
+        english_id INTEGER,
+        english_text TEXT NOT NULL,
+        is_favorite INTEGER DEFAULT 0,
+        difficulty_level TEXT,
+        created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        turkish_search TEXT GENERATED ALWAYS AS ({TURKISH_SEARCH_SQL}) VIRTUAL
+    )
+'''
+
+# --compact layout: no created_at / is_favorite, difficulty_level stored as
+# its index in CEFR_LEVELS (0 = A1 ... 3 = B2) here and in sentence_shuffle
+# and sentence_level_stats, so level filters take the index in every table
+COMPACT_SENTENCES_SCHEMA = f'''
+    CREATE TABLE sentences_compact (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        turkish_id INTEGER,
+        turkish_text TEXT NOT NULL,
+        english_id INTEGER,
+        english_text TEXT NOT NULL,
+        difficulty_level INTEGER,
+        turkish_search TEXT GENERATED ALWAYS AS ({TURKISH_SEARCH_SQL}) VIRTUAL
+    )
+'''
+COMPACT_SENTENCE_SHUFFLE_SCHEMA = '''
+    CREATE TABLE sentence_shuffle_compact (
+        difficulty_level INTEGER NOT NULL,
+        shuffle_key INTEGER NOT NULL,
+        sentence_id INTEGER NOT NULL,
+        PRIMARY KEY (difficulty_level, shuffle_key)
+    ) WITHOUT ROWID
+'''
+COMPACT_LEVEL_STATS_SCHEMA = '''
+    CREATE TABLE sentence_level_stats_compact (
+        difficulty_level INTEGER PRIMARY KEY,
+        sentence_count INTEGER NOT NULL
+    ) WITHOUT ROWID
+'''
+
+# One row per (word, part of speech, level) from the Oxford list, so
+# "account n. B1, v. B2" keeps its verb level. The (level, pos, word_id)
+# index covers level-filtered lookups such as "B1 verbs".
+VOCABULARY_LEVELS_SCHEMA = [
+    '''
+    CREATE TABLE vocabulary_levels (
+        word_id INTEGER NOT NULL REFERENCES vocabulary(id),
+        pos TEXT NOT NULL,
+        level TEXT NOT NULL,
+        PRIMARY KEY (word_id, pos, level)
+    ) WITHOUT ROWID
+    ''',
+    'CREATE INDEX idx_vocabulary_levels_level_pos ON vocabulary_levels(level, pos, word_id)',
+]
+
+# Oxford list abbreviations -> the part_of_speech names used in vocabulary
+POS_NAMES = {
+    'n.': 'noun',
+    'v.': 'verb',
+    'adj.': 'adjective',
+    'adv.': 'adverb',
+    'prep.': 'preposition',
+    'pron.': 'pronoun',
+    'det.': 'determiner',
+    'conj.': 'conjunction',
+    'exclam.': 'exclamation',
+    'modal v.': 'modal verb',
+    'auxiliary v.': 'auxiliary verb',
+}
+
+# Larger pages barely shrink the file; 4 KB keeps each random lookup's
+# page-cache footprint small on device
+COMPACT_PAGE_SIZE = 4096
+
+WORD_SENTENCES_SCHEMA = '''
+    CREATE TABLE word_sentences (
+        vocab_id INTEGER NOT NULL,
+        sentence_id INTEGER NOT NULL,
+        token_pos INTEGER NOT NULL,
+        PRIMARY KEY (vocab_id, sentence_id, token_pos)
+    ) WITHOUT ROWID
+'''
+
+WORD_EXAMPLES_SCHEMA = '''
+    CREATE TABLE word_examples (
+        vocab_id INTEGER NOT NULL,
+        rank INTEGER NOT NULL,
+        sentence_id INTEGER NOT NULL,
+        PRIMARY KEY (vocab_id, rank)
+    ) WITHOUT ROWID
+'''
+
+SENTENCE_SHUFFLE_SCHEMA = '''
+    CREATE TABLE sentence_shuffle (
+        difficulty_level TEXT NOT NULL,
+        shuffle_key INTEGER NOT NULL,
+        sentence_id INTEGER NOT NULL,
+        PRIMARY KEY (difficulty_level, shuffle_key)
+    ) WITHOUT ROWID
+'''
+
+# Per-level shard output (--shards)
+SHARD_FILENAME = 'sentences_{level}.db'
+SHARD_MANIFEST = 'sentences_manifest.json'
+
+# Secondary indexes on sentences, built after the table is loaded
+SENTENCE_INDEXES = [
+    'CREATE INDEX idx_turkish_text ON sentences(turkish_text)',
+    'CREATE INDEX idx_english_text ON sentences(english_text)',
+    'CREATE INDEX idx_is_favorite ON sentences(is_favorite)',
+]
+
+# Full-text index over both sides of each pair. Prefix indexes let 'kit*'
+# style queries read the index instead of scanning.
+SENTENCES_FTS_SCHEMA = '''
+    CREATE VIRTUAL TABLE sentences_fts USING fts5(
+        turkish_search,
+        english_text,
+        content=sentences,
+        content_rowid=id,
+        tokenize="unicode61 remove_diacritics 2",
+        prefix='2 3'
+    )
+'''
+
+# Word boundaries used to tokenize English text. Matches the app's
+# case-insensitive \b regex: "don't" -> don, t and "T-shirt" -> t, shirt.
+WORD_TOKEN_RE = re.compile(r'[a-z0-9]+')
+
+# Sentences handed to each tokenizer worker at a time
+TOKENIZE_CHUNK_SIZE = 20000
+
+CEFR_LEVELS = ['A1', 'A2', 'B1', 'B2']
+LEVEL_INDEX = {level: i for i, level in enumerate(CEFR_LEVELS)}
+
+# Vocabulary-based difficulty: a sentence gets the level of its 90th
+# percentile classified English token, so one rare word doesn't make it B2.
+# Tokens that aren't Oxford words (names, numbers, words past B2) are left
+# unclassified rather than counted as B2.
+DIFFICULTY_PERCENTILE = 0.9
+
+# Suffixes stripped to find the Oxford headword of an inflected token
+INFLECTION_SUFFIXES = [
+    ('ies', 'y'), ('ied', 'y'),
+    ('ing', ''), ('ing', 'e'),
+    ('es', ''), ('ed', ''), ('ed', 'e'),
+    ('s', ''), ('d', ''),
+]
+
+# Forms suffix stripping can't recover -> their Oxford headword: be/have/do/go,
+# irregular plurals and past forms, and the stems WORD_TOKEN_RE leaves of
+# negative contractions ("didn't" -> didn, t)
+IRREGULAR_FORMS = {
+    'am': 'be', 'is': 'be', 'are': 'be', 'was': 'be', 'were': 'be', 'been': 'be',
+    'has': 'have', 'had': 'have',
+    'does': 'do', 'did': 'do', 'done': 'do',
+    'goes': 'go', 'went': 'go', 'gone': 'go',
+    'an': 'a',
+    'isn': 'be', 'aren': 'be', 'wasn': 'be', 'weren': 'be',
+    'hasn': 'have', 'haven': 'have', 'hadn': 'have',
+    'don': 'do', 'doesn': 'do', 'didn': 'do',
+    'won': 'will', 'cannot': 'can', 'couldn': 'could', 'wouldn': 'would',
+    'shouldn': 'should', 'mustn': 'must', 'needn': 'need',
+    'children': 'child', 'men': 'man', 'women': 'woman', 'feet': 'foot', 'teeth': 'tooth',
+    'mice': 'mouse', 'geese': 'goose', 'wives': 'wife', 'knives': 'knife', 'lives': 'life',
+    'leaves': 'leaf', 'halves': 'half', 'shelves': 'shelf', 'thieves': 'thief', 'wolves': 'wolf',
+    'ate': 'eat', 'eaten': 'eat', 'began': 'begin', 'begun': 'begin', 'bit': 'bite', 'bitten': 'bite',
+    'blew': 'blow', 'blown': 'blow', 'broke': 'break', 'broken': 'break', 'brought': 'bring',
+    'built': 'build', 'burnt': 'burn', 'bought': 'buy', 'caught': 'catch', 'chose': 'choose',
+    'chosen': 'choose', 'came': 'come', 'dealt': 'deal', 'drew': 'draw', 'drawn': 'draw',
+    'dreamt': 'dream', 'drank': 'drink', 'drunk': 'drink', 'drove': 'drive', 'driven': 'drive',
+    'fell': 'fall', 'fallen': 'fall', 'fed': 'feed', 'felt': 'feel', 'fought': 'fight',
+    'found': 'find', 'flew': 'fly', 'flown': 'fly', 'forgot': 'forget', 'forgotten': 'forget',
+    'forgave': 'forgive', 'forgiven': 'forgive', 'froze': 'freeze', 'frozen': 'freeze',
+    'got': 'get', 'gotten': 'get', 'gave': 'give', 'given': 'give', 'grew': 'grow', 'grown': 'grow',
+    'hung': 'hang', 'heard': 'hear', 'hid': 'hide', 'hidden': 'hide', 'held': 'hold',
+    'kept': 'keep', 'knew': 'know', 'known': 'know', 'laid': 'lay', 'led': 'lead', 'learnt': 'learn',
+    'left': 'leave', 'lent': 'lend', 'lay': 'lie', 'lain': 'lie', 'lit': 'light', 'lost': 'lose',
+    'made': 'make', 'meant': 'mean', 'met': 'meet', 'paid': 'pay', 'ran': 'run', 'rang': 'ring',
+    'rung': 'ring', 'rode': 'ride', 'ridden': 'ride', 'rose': 'rise', 'risen': 'rise',
+    'said': 'say', 'saw': 'see', 'seen': 'see', 'sold': 'sell', 'sent': 'send', 'shook': 'shake',
+    'shaken': 'shake', 'shone': 'shine', 'shot': 'shoot', 'showed': 'show', 'shown': 'show',
+    'sang': 'sing', 'sung': 'sing', 'sank': 'sink', 'sunk': 'sink', 'sat': 'sit', 'slept': 'sleep',
+    'slid': 'slide', 'spoke': 'speak', 'spoken': 'speak', 'spent': 'spend', 'spelt': 'spell',
+    'spun': 'spin', 'stood': 'stand', 'stole': 'steal', 'stolen': 'steal', 'stuck': 'stick',
+    'struck': 'strike', 'swore': 'swear', 'sworn': 'swear', 'swam': 'swim', 'swum': 'swim',
+    'took': 'take', 'taken': 'take', 'taught': 'teach', 'tore': 'tear', 'torn': 'tear',
+    'told': 'tell', 'thought': 'think', 'threw': 'throw', 'thrown': 'throw',
+    'understood': 'understand', 'woke': 'wake', 'woken': 'wake', 'wore': 'wear', 'worn': 'wear',
+    'wrote': 'write', 'written': 'write',
+}
+
+# Pieces WORD_TOKEN_RE splits off contractions ("it's", "I'll", "we've",
+# "you're"); like single letters they say nothing about difficulty
+CONTRACTION_FRAGMENTS = {'ll', 're', 've'}
+
+# Example sentence ranking (word_examples)
+EXAMPLES_PER_WORD = 10
+IDEAL_EXAMPLE_LENGTH = 8      # English tokens
+EXAMPLE_LENGTH_SPREAD = 6.0
+EXAMPLE_SCORE_WEIGHTS = {
+    'length': 0.4,
+    'difficulty': 0.35,
+    'coverage': 0.25,
+}
+
+# Seed for the per-level shuffle order used for random sentence draws
+DEFAULT_SHUFFLE_SEED = 42
+# The seed sentence_shuffle was last drawn with, under key 'shuffle_seed'.
+# Incremental updates and normalization.py --apply redraw with it, so only
+# a full build or --reshuffle changes the order the app sees
+BUILD_STATE_SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS build_state (
+        key TEXT PRIMARY KEY,
+        value
+    ) WITHOUT ROWID
+'''
+
+# Words used to compare FTS MATCH latency with the app's LIKE query
+FTS_BENCHMARK_WORDS = ['hello', 'water', 'tomorrow', 'umbrella']
+FTS_BENCHMARK_TURKISH_WORDS = ['merhaba', 'şarkı', 'ışık']
+FTS_BENCHMARK_RUNS = 5
 
 def create_vocabulary_database():
     """Create vocabulary.db from merged CSV"""
-    ////print("\n📚 Creating vocabulary database...")
+    print("\n📚 Creating vocabulary database...")
 
     db_path = 'vocabulary.db'
 
@@ -50,7 +310,7 @@ def create_vocabulary_database():
     cursor.execute('CREATE INDEX idx_is_learned ON vocabulary(is_learned)')
 
     # Load and insert data
-    with open('vocabulary_with_levels.csv', 'r', encoding='utf-8') as f:
+    with open(VOCABULARY_CSV, 'r', encoding='utf-8') as f:
         reader = csv.DictReader(f)
         rows_inserted = 0
 
@@ -76,10 +336,13 @@ def create_vocabulary_database():
                 ))
                 rows_inserted += 1
             except sqlite3.IntegrityError as e:
-                ////print(f"⚠️  Duplicate word skipped: {row['word']}")
+                print(f"⚠️  Duplicate word skipped: {row['word']}")
 
     conn.commit()
 
+    create_vocabulary_levels(cursor)
+    conn.commit()
+
     # Get statistics
     cursor.execute('SELECT COUNT(*) FROM vocabulary')
     total_words = cursor.fetchone()[0]
@@ -89,21 +352,481 @@ def create_vocabulary_database():
 
     conn.close()
 
-    ////print(f"✅ Vocabulary database created: {db_path}")
-    ////print(f"📊 Total words: {total_words}")
-    ////print("📊 Distribution by level:")
+    print(f"✅ Vocabulary database created: {db_path}")
+    print(f"📊 Total words: {total_words}")
+    print("📊 Distribution by level:")
     for level, count in level_stats:
-        ////print(f"  {level}: {count:4d} words")
+        print(f"  {level}: {count:4d} words")
 
     # Get file size
     size_mb = os.path.getsize(db_path) / (1024 * 1024)
-    ////print(f"💾 Database size: {size_mb:.2f} MB")
+    print(f"💾 Database size: {size_mb:.2f} MB")
 
     return db_path
 
-def create_sentences_database():
+def create_vocabulary_levels(cursor, csv_path=POS_LEVELS_CSV):
+    """
+    Fill vocabulary_levels from the (word, pos, level) triples CSV.
+    Headwords are matched to vocabulary.word case-insensitively; "a, an"
+    style headwords match each of their spellings.
+    """
+    for statement in VOCABULARY_LEVELS_SCHEMA:
+        cursor.execute(statement)
+
+    if not os.path.exists(csv_path):
+        print(f"⚠️  {csv_path} not found, vocabulary_levels left empty (run parse_oxford_layout.py)")
+        return 0
+
+    cursor.execute('SELECT id, LOWER(TRIM(word)) FROM vocabulary')
+    word_ids = {}
+    for word_id, word in cursor.fetchall():
+        word_ids.setdefault(word, word_id)
+
+    rows = set()
+    unmatched = set()
+    with open(csv_path, 'r', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            headword = row['word'].lower().strip()
+            ids = [word_ids[spelling] for spelling in [headword] + headword.split(', ')
+                   if spelling in word_ids]
+            if not ids:
+                unmatched.add(headword)
+                continue
+            pos = POS_NAMES.get(row['pos'], row['pos'])
+            rows.update((word_id, pos, row['level']) for word_id in ids)
+
+    cursor.executemany('INSERT INTO vocabulary_levels VALUES (?, ?, ?)', sorted(rows))
+    cursor.execute('SELECT COUNT(DISTINCT word_id) FROM vocabulary_levels')
+    words = cursor.fetchone()[0]
+    print(f"✅ vocabulary_levels: {len(rows)} (word, pos, level) rows for {words} words "
+          f"({len(unmatched)} Oxford headwords not in vocabulary)")
+    return len(rows)
+
+def estimate_difficulty(turkish_text):
+    """Estimate difficulty based on Turkish sentence length"""
+    word_count = len(turkish_text.split())
+    if word_count <= 5:
+        return 'A1'
+    elif word_count <= 10:
+        return 'A2'
+    elif word_count <= 15:
+        return 'B1'
+    return 'B2'
+
+def read_sentence_pairs(tsv_filename):
+    """Yield (turkish_id, turkish_text, english_id, english_text, difficulty) rows from the TSV file"""
+    with open(tsv_filename, 'r', encoding='utf-8') as f:
+        reader = csv.reader(f, delimiter='\t')
+
+        # Skip header if exists
+        header = next(reader, None)
+
+        for row in reader:
+            if len(row) < 4:
+                continue
+
+            turkish_id = int(row[0]) if row[0].isdigit() else 0
+            turkish_text = row[1].strip()
+            english_id = int(row[2]) if row[2].isdigit() else 0
+            english_text = row[3].strip()
+
+            yield (turkish_id, turkish_text, english_id, english_text, estimate_difficulty(turkish_text))
+
+def report_phase(phase, rows, elapsed):
+    """Print throughput for a single build phase"""
+    rate = rows / elapsed if elapsed > 0 else 0
+    print(f"⏱️  {phase}: {rows:,} rows in {elapsed:.2f}s ({rate:,.0f} rows/sec)")
+
+def build_fts_index(cursor):
+    """Populate sentences_fts from the sentences table and merge it into one segment"""
+    cursor.execute("INSERT INTO sentences_fts(sentences_fts) VALUES('rebuild')")
+    cursor.execute("INSERT INTO sentences_fts(sentences_fts) VALUES('optimize')")
+
+def fold_search_text(text):
+    """Fold a search query the way turkish_search is folded: "Şarkı" -> "Şarki" (unicode61 does the rest)"""
+    return text.replace('ı', 'i')
+
+def fts_index_size(cursor):
+    """Return the on-disk size of the sentences_fts shadow tables in bytes"""
+    try:
+        cursor.execute("SELECT SUM(pgsize) FROM dbstat WHERE name LIKE 'sentences_fts%'")
+    except sqlite3.OperationalError:
+        # SQLite built without dbstat - count the index blobs instead
+        cursor.execute('SELECT SUM(LENGTH(block)) FROM sentences_fts_data')
+    return cursor.fetchone()[0] or 0
+
+def median_latency_ms(cursor, query, params):
+    """Run a query several times and return its median wall time in milliseconds"""
+    timings = []
+    for _ in range(FTS_BENCHMARK_RUNS):
+        started = time.perf_counter()
+        cursor.execute(query, params).fetchall()
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    return timings[len(timings) // 2]
+
+def report_fts_index(cursor, limit=250):
+    """Print FTS index size and MATCH latency next to the app's current LIKE query"""
+    size_mb = fts_index_size(cursor) / (1024 * 1024)
+    print(f"🔎 FTS index size: {size_mb:.2f} MB")
+
+    # Same shape as DatabaseManager.searchSentences (limit * 5 candidate rows)
+    like_query = '''
+        SELECT turkish_id, turkish_text, english_id, english_text, difficulty_level
+        FROM sentences
+        WHERE english_text LIKE ? COLLATE NOCASE
+        LIMIT ?
+    '''
+    match_query = '''
+        SELECT turkish_id, turkish_text, english_id, english_text, difficulty_level
+        FROM sentences
+        WHERE id IN (SELECT rowid FROM sentences_fts WHERE sentences_fts MATCH ? LIMIT ?)
+    '''
+
+    print(f"🔎 Search latency (median of {FTS_BENCHMARK_RUNS} runs, LIMIT {limit}):")
+    for word in FTS_BENCHMARK_WORDS:
+        like_ms = median_latency_ms(cursor, like_query, (f'%{word}%', limit))
+        match_ms = median_latency_ms(cursor, match_query, (f'english_text : "{word}"', limit))
+        print(f"  {word:<10} LIKE {like_ms:8.2f} ms   MATCH {match_ms:8.2f} ms")
+
+    turkish_like_query = like_query.replace('english_text LIKE', 'turkish_text LIKE')
+    for word in FTS_BENCHMARK_TURKISH_WORDS:
+        like_ms = median_latency_ms(cursor, turkish_like_query, (f'%{word}%', limit))
+        match_ms = median_latency_ms(cursor, match_query, (f'turkish_search : "{fold_search_text(word)}"', limit))
+        print(f"  {word:<10} LIKE {like_ms:8.2f} ms   MATCH {match_ms:8.2f} ms")
+
+def tokenize_english(text):
+    """Split English text into lowercase word tokens"""
+    return WORD_TOKEN_RE.findall(text.lower())
+
+def load_vocabulary_lookup(vocab_db_path):
+    """Map each word's first token to the (tokens, vocab_id) entries starting with it"""
+    conn = sqlite3.connect(vocab_db_path)
+    lookup = {}
+    for vocab_id, word in conn.execute('SELECT id, word FROM vocabulary'):
+        tokens = tuple(tokenize_english(word))
+        if tokens:
+            lookup.setdefault(tokens[0], []).append((tokens, vocab_id))
+    conn.close()
+    return lookup
+
+def load_word_levels(csv_path=VOCABULARY_CSV):
+    """
+    Map single-word vocabulary entries to their lowest CEFR level index.
+    "a, an" style headwords count for each of their spellings.
+    """
+    word_levels = {}
+    with open(csv_path, 'r', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            level = LEVEL_INDEX.get(row['level'], len(CEFR_LEVELS) - 1)
+            for spelling in row['word'].split(', '):
+                tokens = tokenize_english(spelling)
+                if len(tokens) == 1:
+                    word_levels[tokens[0]] = min(level, word_levels.get(tokens[0], level))
+    return word_levels
+
+def lookup_token_level(token, word_levels):
+    """
+    CEFR level index of a token or its base form, or None if it is not in
+    the vocabulary or is a single letter or contraction fragment.
+    """
+    if len(token) == 1 or token in CONTRACTION_FRAGMENTS:
+        return None
+    level = word_levels.get(token)
+    if level is not None:
+        return level
+
+    lemma = IRREGULAR_FORMS.get(token)
+    if lemma is not None and lemma in word_levels:
+        return word_levels[lemma]
+
+    for suffix, replacement in INFLECTION_SUFFIXES:
+        if token.endswith(suffix) and len(token) > len(suffix) + 1:
+            stem = token[:-len(suffix)]
+            level = word_levels.get(stem + replacement)
+            # "running" -> "runn" -> "run"
+            if level is None and not replacement and len(stem) > 2 and stem[-1] == stem[-2]:
+                level = word_levels.get(stem[:-1])
+            if level is not None:
+                return level
+    return None
+
+_vocab_lookup = None
+_word_levels = None
+_token_level_cache = {}
+
+def _init_tokenize_worker(vocab_lookup, word_levels):
+    global _vocab_lookup, _word_levels
+    _vocab_lookup = vocab_lookup
+    _word_levels = word_levels
+
+def _token_level(token):
+    if token not in _token_level_cache:
+        _token_level_cache[token] = lookup_token_level(token, _word_levels)
+    return _token_level_cache[token]
+
+def _tokenize_chunk(rows):
+    """Tokenize (id, english_text) rows.
+
+    Returns the vocabulary hits, the token count of each row and, when word
+    levels are loaded, a per-row histogram of token CEFR levels.
+    """
+    matches = []
+    token_counts = []
+    level_histograms = []
+    for sentence_id, english_text in rows:
+        tokens = tokenize_english(english_text)
+        histogram = [0] * len(CEFR_LEVELS)
+
+        if _word_levels is not None:
+            for token in tokens:
+                level = _token_level(token)
+                if level is not None:
+                    histogram[level] += 1
+
+        token_counts.append(len(tokens))
+        level_histograms.append(histogram)
+
+        for pos, token in enumerate(tokens):
+            for word_tokens, vocab_id in _vocab_lookup.get(token, ()):
+                # Multi-word entries ("according to") must match token by token
+                if tuple(tokens[pos:pos + len(word_tokens)]) == word_tokens:
+                    matches.append((vocab_id, sentence_id, pos))
+    return matches, token_counts, level_histograms
+
+def index_sentence_words(cursor, rows, vocab_db_path='vocabulary.db', word_levels=None, jobs=None):
+    """Tokenize (id, english_text) rows into word_sentences(vocab_id, sentence_id, token_pos).
+
+    Returns (token_counts, level_counts): English token counts indexed by
+    sentence id, and an (ids x levels) matrix of token CEFR-level counts
+    (None unless word_levels is given). Both are None when vocabulary.db is
+    missing.
+    """
+    if not os.path.exists(vocab_db_path):
+        print(f"⚠️  {vocab_db_path} not found, word_sentences left empty")
+        return None, None
+
+    vocab_lookup = load_vocabulary_lookup(vocab_db_path)
+    chunks = [rows[i:i + TOKENIZE_CHUNK_SIZE] for i in range(0, len(rows), TOKENIZE_CHUNK_SIZE)]
+
+    max_id = max((sentence_id for sentence_id, _ in rows), default=0)
+    token_counts = np.zeros(max_id + 1, dtype=np.int32)
+    level_counts = np.zeros((max_id + 1, len(CEFR_LEVELS)), dtype=np.int32)
+
+    links_inserted = 0
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_tokenize_worker,
+                             initargs=(vocab_lookup, word_levels)) as executor:
+        for chunk, (matches, chunk_counts, chunk_levels) in zip(chunks, executor.map(_tokenize_chunk, chunks)):
+            cursor.executemany('INSERT INTO word_sentences VALUES (?, ?, ?)', matches)
+            links_inserted += len(matches)
+            chunk_ids = [sentence_id for sentence_id, _ in chunk]
+            token_counts[chunk_ids] = chunk_counts
+            level_counts[chunk_ids] = chunk_levels
+
+    print(f"🔗 Linked {links_inserted:,} word occurrences across {len(rows):,} sentences")
+    return token_counts, (level_counts if word_levels is not None else None)
+
+def create_word_sentences_index(cursor, vocab_db_path='vocabulary.db', word_levels=None, jobs=None):
+    """Create word_sentences and fill it from every sentence"""
+    cursor.execute(WORD_SENTENCES_SCHEMA)
+
+    cursor.execute('SELECT id, english_text FROM sentences ORDER BY id')
+    return index_sentence_words(cursor, cursor.fetchall(), vocab_db_path, word_levels, jobs)
+
+def count_english_tokens(cursor):
+    """English token counts indexed by sentence id"""
+    cursor.execute('SELECT id, english_text FROM sentences ORDER BY id')
+    rows = cursor.fetchall()
+    token_counts = np.zeros(max((sentence_id for sentence_id, _ in rows), default=0) + 1, dtype=np.int32)
+    token_counts[[sentence_id for sentence_id, _ in rows]] = [len(tokenize_english(text)) for _, text in rows]
+    return token_counts
+
+def classify_sentence_difficulty(cursor, level_counts, percentile=DIFFICULTY_PERCENTILE):
+    """Set each sentence's level to the given percentile of its English token levels.
+
+    Sentences without any classifiable token keep their length-based estimate.
+    """
+    cumulative = level_counts.cumsum(axis=1)
+    classified = cumulative[:, -1]
+    target = np.ceil(classified * percentile)
+    # Index of the first level whose cumulative count reaches the target
+    levels = (cumulative < target[:, None]).sum(axis=1)
+
+    sentence_ids = np.flatnonzero(classified)
+    level_names = np.array(CEFR_LEVELS)[levels[sentence_ids]]
+    cursor.executemany(
+        'UPDATE sentences SET difficulty_level = ? WHERE id = ?',
+        zip(level_names.tolist(), sentence_ids.tolist())
+    )
+    return len(sentence_ids)
+
+def write_level_stats(cursor):
+    """Store per-level sentence counts in sentence_level_stats"""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS sentence_level_stats (
+            difficulty_level TEXT PRIMARY KEY,
+            sentence_count INTEGER NOT NULL
+        ) WITHOUT ROWID
+    ''')
+    cursor.execute('DELETE FROM sentence_level_stats')
+    cursor.execute('''
+        INSERT INTO sentence_level_stats (difficulty_level, sentence_count)
+        SELECT difficulty_level, COUNT(*) FROM sentences GROUP BY difficulty_level
+    ''')
+
+def _rank_within_groups(groups):
+    """0-based position of each element inside its run of equal values in a sorted array"""
+    if len(groups) == 0:
+        return np.zeros(0, dtype=np.int64)
+    starts = np.flatnonzero(np.r_[True, groups[1:] != groups[:-1]])
+    run_lengths = np.diff(np.r_[starts, len(groups)])
+    return np.arange(len(groups)) - np.repeat(starts, run_lengths)
+
+def create_word_examples(cursor, token_counts, vocab_db_path='vocabulary.db'):
+    """Score every (word, sentence) candidate and store the best EXAMPLES_PER_WORD per word"""
+    cursor.execute('DROP TABLE IF EXISTS word_examples')
+    cursor.execute(WORD_EXAMPLES_SCHEMA)
+
+    if token_counts is None:
+        return 0
+
+    # Candidate pairs, one per (word, sentence) regardless of how often the word repeats
+    cursor.execute('SELECT DISTINCT vocab_id, sentence_id FROM word_sentences')
+    pairs = np.array(cursor.fetchall(), dtype=np.int64).reshape(-1, 2)
+    vocab_ids, sentence_ids = pairs[:, 0], pairs[:, 1]
+
+    # Per-sentence feature arrays indexed by sentence id
+    size = len(token_counts)
+    english_ids = np.zeros(size, dtype=np.int64)
+    sentence_levels = np.zeros(size, dtype=np.int8)
+    # --compact databases already store the level as its CEFR_LEVELS index
+    cursor.execute('SELECT id, english_id, difficulty_level FROM sentences')
+    for sentence_id, english_id, difficulty in cursor:
+        english_ids[sentence_id] = english_id
+        sentence_levels[sentence_id] = (difficulty if isinstance(difficulty, int)
+                                        else LEVEL_INDEX.get(difficulty, len(CEFR_LEVELS) - 1))
+    vocab_hits = np.bincount(sentence_ids, minlength=size)
+
+    conn = sqlite3.connect(vocab_db_path)
+    vocab_rows = conn.execute('SELECT id, level FROM vocabulary').fetchall()
+    conn.close()
+    word_levels = np.zeros(max(vocab_id for vocab_id, _ in vocab_rows) + 1, dtype=np.int8)
+    for vocab_id, level in vocab_rows:
+        word_levels[vocab_id] = LEVEL_INDEX.get(level, len(CEFR_LEVELS) - 1)
+
+    lengths = token_counts[sentence_ids].astype(np.float64)
+    length_score = np.exp(-((lengths - IDEAL_EXAMPLE_LENGTH) / EXAMPLE_LENGTH_SPREAD) ** 2)
+    # Sentences at or just below the word's own level read best
+    level_gap = np.abs(sentence_levels[sentence_ids] - word_levels[vocab_ids])
+    difficulty_score = 1.0 - level_gap / (len(CEFR_LEVELS) - 1)
+    # Share of the sentence made of Oxford words the learner is studying anyway
+    coverage_score = np.minimum(vocab_hits[sentence_ids] / np.maximum(lengths, 1), 1.0)
+
+    scores = (EXAMPLE_SCORE_WEIGHTS['length'] * length_score
+              + EXAMPLE_SCORE_WEIGHTS['difficulty'] * difficulty_score
+              + EXAMPLE_SCORE_WEIGHTS['coverage'] * coverage_score)
+
+    # Diversity: the same English sentence often has several Turkish
+    # translations - keep only its best-scoring pair for each word
+    pair_english = english_ids[sentence_ids]
+    order = np.lexsort((sentence_ids, -scores, pair_english, vocab_ids))
+    first_of_english = np.r_[True, (vocab_ids[order][1:] != vocab_ids[order][:-1])
+                             | (pair_english[order][1:] != pair_english[order][:-1])]
+    order = order[first_of_english]
+
+    # Rank the surviving candidates per word and keep the top K
+    order = order[np.lexsort((sentence_ids[order], -scores[order], vocab_ids[order]))]
+    ranks = _rank_within_groups(vocab_ids[order])
+    keep = ranks < EXAMPLES_PER_WORD
+    selected = order[keep]
+
+    cursor.executemany(
+        'INSERT INTO word_examples VALUES (?, ?, ?)',
+        zip(vocab_ids[selected].tolist(), ranks[keep].tolist(), sentence_ids[selected].tolist())
+    )
+
+    words_covered = len(np.unique(vocab_ids[selected]))
+    print(f"🏅 Stored {len(selected):,} ranked examples for {words_covered:,} words")
+    return len(pairs)
+
+def assign_shuffle_keys(cursor, seed):
+    """Fill sentence_shuffle with a seeded, dense 0..n-1 ordering of the sentences in each level.
+
+    A random draw of n sentences from a level is then a range read from a
+    random starting key instead of ORDER BY RANDOM() over the whole level:
+
+        SELECT s.* FROM sentence_shuffle k JOIN sentences s ON s.id = k.sentence_id
+        WHERE k.difficulty_level = ? AND k.shuffle_key >= ?
+        ORDER BY k.shuffle_key LIMIT ?
+
+    The level size is MAX(shuffle_key) + 1, also a single index seek.
+    """
+    rng = np.random.default_rng(seed)
+
+    cursor.execute('DELETE FROM sentence_shuffle')
+    cursor.execute('SELECT difficulty_level, id FROM sentences ORDER BY difficulty_level, id')
+    rows = cursor.fetchall()
+
+    by_level = {}
+    for level, sentence_id in rows:
+        by_level.setdefault(level, []).append(sentence_id)
+
+    for level, sentence_ids in by_level.items():
+        shuffled = rng.permutation(np.array(sentence_ids, dtype=np.int64))
+        cursor.executemany(
+            'INSERT INTO sentence_shuffle VALUES (?, ?, ?)',
+            zip([level] * len(shuffled), range(len(shuffled)), shuffled.tolist())
+        )
+
+    return len(rows)
+
+def save_shuffle_seed(cursor, seed):
+    """Record the seed sentence_shuffle was drawn with"""
+    cursor.execute(BUILD_STATE_SCHEMA)
+    cursor.execute("INSERT OR REPLACE INTO build_state VALUES ('shuffle_seed', ?)", (seed,))
+
+def load_shuffle_seed(cursor):
+    """The seed sentence_shuffle was last drawn with (DEFAULT_SHUFFLE_SEED for databases that predate build_state)"""
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'build_state'")
+    if not cursor.fetchone():
+        return DEFAULT_SHUFFLE_SEED
+    cursor.execute("SELECT value FROM build_state WHERE key = 'shuffle_seed'")
+    row = cursor.fetchone()
+    return row[0] if row else DEFAULT_SHUFFLE_SEED
+
+def create_sentence_shuffle(cursor, seed=DEFAULT_SHUFFLE_SEED):
+    """Create sentence_shuffle and assign its initial keys"""
+    cursor.execute('DROP TABLE IF EXISTS sentence_shuffle')
+    cursor.execute(SENTENCE_SHUFFLE_SCHEMA)
+    save_shuffle_seed(cursor, seed)
+    return assign_shuffle_keys(cursor, seed)
+
+def reshuffle_sentences(db_path='sentences.db', seed=None):
+    """Rotate the shuffle keys of an existing sentences.db without touching the sentence rows"""
+    if seed is None:
+        seed = secrets.randbits(32)
+    print(f"\n🔀 Reshuffling {db_path} (seed: {seed})...")
+
+    if not os.path.exists(db_path):
+        print(f"❌ File not found: {db_path}")
+        return False
+
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+
+    started = time.perf_counter()
+    rows_shuffled = assign_shuffle_keys(cursor, seed)
+    save_shuffle_seed(cursor, seed)
+    conn.commit()
+    report_phase('reshuffle', rows_shuffled, time.perf_counter() - started)
+
+    conn.close()
+    return True
+
+def create_sentences_database(tsv_filename=TSV_FILENAME, bulk_load=False, jobs=None, seed=DEFAULT_SHUFFLE_SEED,
+                              difficulty='vocabulary'):
     """Create sentences.db from TSV file"""
-    ////print("\n📝 Creating sentences database...")
+    print("\n📝 Creating sentences database...")
 
     db_path = 'sentences.db'
 
@@ -114,84 +837,99 @@ def create_sentences_database():
     conn = sqlite3.connect(db_path)
     cursor = conn.cursor()
 
-    # Create sentences table
-    cursor.execute('''
-        CREATE TABLE sentences (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            turkish_id INTEGER,
-            turkish_text TEXT NOT NULL,
-            english_id INTEGER,
-            english_text TEXT NOT NULL,
-            is_favorite INTEGER DEFAULT 0,
-            difficulty_level TEXT,
-            created_at TEXT DEFAULT CURRENT_TIMESTAMP
-        )
-    ''')
+    # Must precede the first table; lets normalization.py --vacuum hand
+    # freed pages back with an incremental vacuum instead of a full VACUUM
+    cursor.execute('PRAGMA auto_vacuum = INCREMENTAL')
 
-    # Create indexes
-    cursor.execute('CREATE INDEX idx_turkish_text ON sentences(turkish_text)')
-    cursor.execute('CREATE INDEX idx_english_text ON sentences(english_text)')
-    cursor.execute('CREATE INDEX idx_is_favorite ON sentences(is_favorite)')
-    cursor.execute('CREATE VIRTUAL TABLE sentences_fts USING fts5(turkish_text, english_text, content=sentences)')
+    if bulk_load:
+        # The file is rebuilt from scratch, so a crash mid-build only means
+        # running the script again - skip journaling and fsyncs entirely.
+        print("⚡ Bulk-load mode: journal/sync off, single transaction")
+        for pragma in BULK_LOAD_PRAGMAS:
+            cursor.execute(pragma)
+        conn.isolation_level = None
+        cursor.execute('BEGIN')
 
-    # Load TSV file
-    tsv_filename = 'Türkçe-İngilizce dillerindeki cümle eşleri - 2025-11-10.tsv'
+    # Create sentences table
+    cursor.execute(SENTENCES_SCHEMA)
+    cursor.execute(SENTENCES_FTS_SCHEMA)
 
-    ////print(f"📖 Reading {tsv_filename}...")
+    # Load TSV file
+    print(f"📖 Reading {tsv_filename}...")
 
     rows_inserted = 0
     batch_size = 1000
     batch = []
 
     try:
-        with open(tsv_filename, 'r', encoding='utf-8') as f:
-            reader = csv.reader(f, delimiter='\t')
-
-            # Skip header if exists
-            header = next(reader, None)
-
-            for row in reader:
-                if len(row) < 4:
-                    continue
-
-                turkish_id = int(row[0]) if row[0].isdigit() else 0
-                turkish_text = row[1].strip()
-                english_id = int(row[2]) if row[2].isdigit() else 0
-                english_text = row[3].strip()
-
-                # Estimate difficulty based on sentence length
-                word_count = len(turkish_text.split())
-                if word_count <= 5:
-                    difficulty = 'A1'
-                elif word_count <= 10:
-                    difficulty = 'A2'
-                elif word_count <= 15:
-                    difficulty = 'B1'
-                else:
-                    difficulty = 'B2'
-
-                batch.append((turkish_id, turkish_text, english_id, english_text, difficulty))
-
-                if len(batch) >= batch_size:
-                    cursor.executemany('''
-                        INSERT INTO sentences (turkish_id, turkish_text, english_id, english_text, difficulty_level)
-                        VALUES (?, ?, ?, ?, ?)
-                    ''', batch)
-                    rows_inserted += len(batch)
-                    batch = []
-
-                    if rows_inserted % 50000 == 0:
-                        ////print(f"  Processed {rows_inserted:,} sentences...")
-
-            # Insert remaining batch
-            if batch:
+        insert_started = time.perf_counter()
+
+        for sentence_pair in read_sentence_pairs(tsv_filename):
+            batch.append(sentence_pair)
+
+            if len(batch) >= batch_size:
                 cursor.executemany('''
                     INSERT INTO sentences (turkish_id, turkish_text, english_id, english_text, difficulty_level)
                     VALUES (?, ?, ?, ?, ?)
                 ''', batch)
                 rows_inserted += len(batch)
+                batch = []
 
-        conn.commit()
+                if rows_inserted % 50000 == 0:
+                    print(f"  Processed {rows_inserted:,} sentences...")
+
+        # Insert remaining batch
+        if batch:
+            cursor.executemany('''
+                INSERT INTO sentences (turkish_id, turkish_text, english_id, english_text, difficulty_level)
+                VALUES (?, ?, ?, ?, ?)
+            ''', batch)
+            rows_inserted += len(batch)
+
+        report_phase('insert', rows_inserted, time.perf_counter() - insert_started)
+
+        # Build indexes once over the loaded table instead of maintaining
+        # them row by row during the insert phase
+        index_started = time.perf_counter()
+        for statement in SENTENCE_INDEXES:
+            cursor.execute(statement)
+        report_phase('index', rows_inserted, time.perf_counter() - index_started)
+
+        fts_started = time.perf_counter()
+        build_fts_index(cursor)
+        report_phase('fts', rows_inserted, time.perf_counter() - fts_started)
+
+        words_started = time.perf_counter()
+        word_levels = None
+        if difficulty == 'vocabulary':
+            if os.path.exists(VOCABULARY_CSV):
+                word_levels = load_word_levels()
+            else:
+                print(f"⚠️  {VOCABULARY_CSV} not found, keeping length-based difficulty")
+        token_counts, level_counts = create_word_sentences_index(cursor, word_levels=word_levels, jobs=jobs)
+        report_phase('word index', rows_inserted, time.perf_counter() - words_started)
+
+        if level_counts is not None:
+            classify_started = time.perf_counter()
+            sentences_classified = classify_sentence_difficulty(cursor, level_counts)
+            report_phase('classify', sentences_classified, time.perf_counter() - classify_started)
+
+        examples_started = time.perf_counter()
+        candidates_scored = create_word_examples(cursor, token_counts)
+        report_phase('word examples', candidates_scored, time.perf_counter() - examples_started)
+
+        shuffle_started = time.perf_counter()
+        create_sentence_shuffle(cursor, seed)
+        report_phase('shuffle', rows_inserted, time.perf_counter() - shuffle_started)
+
+        write_level_stats(cursor)
+
+        commit_started = time.perf_counter()
+        if bulk_load:
+            cursor.execute('COMMIT')
+        else:
+            conn.commit()
+        report_phase('commit', rows_inserted, time.perf_counter() - commit_started)
 
         # Get statistics
         cursor.execute('SELECT COUNT(*) FROM sentences')
@@ -200,57 +938,481 @@ def create_sentences_database():
         cursor.execute('SELECT difficulty_level, COUNT(*) FROM sentences GROUP BY difficulty_level ORDER BY difficulty_level')
         difficulty_stats = cursor.fetchall()
 
+        report_fts_index(cursor)
+
         conn.close()
 
-        ////print(f"✅ Sentences database created: {db_path}")
-        ////print(f"📊 Total sentence pairs: {total_sentences:,}")
-        ////print("📊 Distribution by estimated difficulty:")
+        print(f"✅ Sentences database created: {db_path}")
+        print(f"📊 Total sentence pairs: {total_sentences:,}")
+        print("📊 Distribution by estimated difficulty:")
         for level, count in difficulty_stats:
-            ////print(f"  {level}: {count:,} sentences")
+            print(f"  {level}: {count:,} sentences")
 
         # Get file size
         size_mb = os.path.getsize(db_path) / (1024 * 1024)
-        ////print(f"💾 Database size: {size_mb:.2f} MB")
+        print(f"💾 Database size: {size_mb:.2f} MB")
+
+        return db_path
+
+    except FileNotFoundError:
+        print(f"❌ File not found: {tsv_filename}")
+        print("⚠️  Skipping sentences database creation")
+        return None
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        import traceback
+        traceback.print_exc()
+        return None
+
+def sentence_content_hash(turkish_text, english_text):
+    """64-bit fingerprint of a sentence pair's text"""
+    digest = hashlib.blake2b(f"{turkish_text}\t{english_text}".encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'big')
 
+def update_sentences_database(tsv_filename=TSV_FILENAME, db_path='sentences.db', jobs=None,
+                              difficulty='vocabulary'):
+    """Apply a new TSV dump to an existing sentences.db as inserts, updates and deletes.
+
+    Rows are matched on (turkish_id, english_id) and compared by content
+    hash; pairs normalization.py deleted as duplicates (sentence_tombstones)
+    are skipped. The FTS index and word_sentences are patched for the
+    changed rows only; word_examples, sentence_shuffle and
+    sentence_level_stats are re-derived from the patched tables, the
+    shuffle with the seed stored in build_state.
+    """
+    print(f"\n🔁 Updating {db_path} from {tsv_filename}...")
+
+    if not os.path.exists(db_path):
+        print(f"❌ File not found: {db_path} - run a full build first")
+        return None
+
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+
+    if is_compact_database(cursor):
+        conn.close()
+        print(f"❌ {db_path} was built with --compact - rebuild without it to update incrementally")
+        return None
+
+    try:
+        diff_started = time.perf_counter()
+
+        existing = {}
+        cursor.execute('SELECT id, turkish_id, english_id, turkish_text, english_text FROM sentences')
+        for sentence_id, turkish_id, english_id, turkish_text, english_text in cursor:
+            existing[(turkish_id, english_id)] = (sentence_id, sentence_content_hash(turkish_text, english_text))
+
+        tombstones = set()
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sentence_tombstones'")
+        if cursor.fetchone():
+            cursor.execute('SELECT turkish_id, english_id FROM sentence_tombstones')
+            tombstones = set(cursor.fetchall())
+
+        inserts = []
+        updates = []
+        seen = set()
+        skipped = 0
+        for sentence_pair in read_sentence_pairs(tsv_filename):
+            key = (sentence_pair[0], sentence_pair[2])
+            if key in seen:
+                continue
+            seen.add(key)
+            if key in tombstones:
+                skipped += 1
+                continue
+
+            current = existing.get(key)
+            if current is None:
+                inserts.append(sentence_pair)
+            elif current[1] != sentence_content_hash(sentence_pair[1], sentence_pair[3]):
+                updates.append((sentence_pair[1], sentence_pair[3], sentence_pair[4], current[0]))
+
+        deleted_ids = [sentence_id for key, (sentence_id, _) in existing.items() if key not in seen]
+        unchanged = len(existing) - len(updates) - len(deleted_ids)
+        report_phase('diff', len(seen), time.perf_counter() - diff_started)
+
+        apply_started = time.perf_counter()
+
+        # Rows whose old text must leave the FTS index and word_sentences
+        cursor.execute('CREATE TEMP TABLE temp_deleted_ids (id INTEGER PRIMARY KEY)')
+        cursor.executemany('INSERT INTO temp_deleted_ids VALUES (?)', [(sentence_id,) for sentence_id in deleted_ids])
+        cursor.execute('CREATE TEMP TABLE temp_stale_ids (id INTEGER PRIMARY KEY)')
+        cursor.execute('INSERT INTO temp_stale_ids SELECT id FROM temp_deleted_ids')
+        cursor.executemany('INSERT INTO temp_stale_ids VALUES (?)', [(row[3],) for row in updates])
+        # normalization.py must dedup rewritten rows again
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sentence_dedup'")
+        if cursor.fetchone():
+            cursor.execute('DELETE FROM sentence_dedup WHERE id IN (SELECT id FROM temp_stale_ids)')
+        cursor.execute('''
+            INSERT INTO sentences_fts(sentences_fts, rowid, turkish_search, english_text)
+            SELECT 'delete', id, turkish_search, english_text FROM sentences
+            WHERE id IN (SELECT id FROM temp_stale_ids)
+        ''')
+        cursor.execute('DELETE FROM word_sentences WHERE sentence_id IN (SELECT id FROM temp_stale_ids)')
+        cursor.execute('DELETE FROM sentences WHERE id IN (SELECT id FROM temp_deleted_ids)')
+        # normalization.py's redirects into a deleted row have nothing left to resolve to
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sentence_redirects'")
+        if cursor.fetchone():
+            cursor.execute('DELETE FROM sentence_redirects WHERE canonical_id IN (SELECT id FROM temp_deleted_ids)')
+
+        cursor.executemany('''
+            UPDATE sentences SET turkish_text = ?, english_text = ?, difficulty_level = ?
+            WHERE id = ?
+        ''', updates)
+
+        cursor.execute('SELECT COALESCE(MAX(id), 0) FROM sentences')
+        previous_max_id = cursor.fetchone()[0]
+        cursor.execute("SELECT seq FROM sqlite_sequence WHERE name = 'sentences'")
+        sequence = cursor.fetchone()
+        previous_max_id = max(previous_max_id, sequence[0] if sequence else 0)
+        cursor.executemany('''
+            INSERT INTO sentences (turkish_id, turkish_text, english_id, english_text, difficulty_level)
+            VALUES (?, ?, ?, ?, ?)
+        ''', inserts)
+
+        # Rows whose new text must be indexed
+        cursor.execute('CREATE TEMP TABLE temp_fresh_ids (id INTEGER PRIMARY KEY)')
+        cursor.executemany('INSERT INTO temp_fresh_ids VALUES (?)', [(row[3],) for row in updates])
+        cursor.execute('INSERT INTO temp_fresh_ids SELECT id FROM sentences WHERE id > ?', (previous_max_id,))
+        cursor.execute('''
+            INSERT INTO sentences_fts(rowid, turkish_search, english_text)
+            SELECT id, turkish_search, english_text FROM sentences
+            WHERE id IN (SELECT id FROM temp_fresh_ids)
+        ''')
+        cursor.execute("INSERT INTO sentences_fts(sentences_fts) VALUES('optimize')")
+        report_phase('apply', len(inserts) + len(updates) + len(deleted_ids), time.perf_counter() - apply_started)
+
+        derive_started = time.perf_counter()
+        word_levels = None
+        if difficulty == 'vocabulary' and os.path.exists(VOCABULARY_CSV):
+            word_levels = load_word_levels()
+
+        cursor.execute('''
+            SELECT id, english_text FROM sentences
+            WHERE id IN (SELECT id FROM temp_fresh_ids) ORDER BY id
+        ''')
+        _, level_counts = index_sentence_words(cursor, cursor.fetchall(), word_levels=word_levels, jobs=jobs)
+        if level_counts is not None:
+            classify_sentence_difficulty(cursor, level_counts)
+
+        if os.path.exists('vocabulary.db'):
+            create_word_examples(cursor, count_english_tokens(cursor))
+        else:
+            # Nothing can be re-ranked; only drop the examples whose sentence changed or went away
+            print("⚠️  vocabulary.db not found, word_examples not re-ranked")
+            cursor.execute('DELETE FROM word_examples WHERE sentence_id IN (SELECT id FROM temp_stale_ids)')
+        assign_shuffle_keys(cursor, load_shuffle_seed(cursor))
+        write_level_stats(cursor)
+        report_phase('derived tables', len(inserts) + len(updates), time.perf_counter() - derive_started)
+
+        conn.commit()
+        conn.close()
+
+        print("✅ Sentences database updated")
+        print(f"📊 Inserted: {len(inserts):,}  Updated: {len(updates):,}  "
+              f"Deleted: {len(deleted_ids):,}  Unchanged: {unchanged:,}  Skipped (deduplicated): {skipped:,}")
         return db_path
 
     except FileNotFoundError:
-        ////print(f"❌ File not found: {tsv_filename}")
-        ////print("⚠️  Skipping sentences database creation")
+        conn.close()
+        print(f"❌ File not found: {tsv_filename}")
         return None
     except Exception as e:
-        ////print(f"❌ Error: {e}")
+        conn.rollback()
+        conn.close()
+        print(f"❌ Error: {e}")
         import traceback
         traceback.print_exc()
         return None
 
+def file_sha256(path):
+    """Hex SHA-256 of a file"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def _build_shard(shard):
+    """Write one level's sentences_<level>.db and return its manifest entry"""
+    level, sentences, word_links, examples, shuffle_keys, compact = shard
+    shard_path = SHARD_FILENAME.format(level=level)
+
+    if os.path.exists(shard_path):
+        os.remove(shard_path)
+
+    conn = sqlite3.connect(shard_path)
+    cursor = conn.cursor()
+    for pragma in BULK_LOAD_PRAGMAS:
+        cursor.execute(pragma)
+    conn.isolation_level = None
+    cursor.execute('BEGIN')
+
+    cursor.execute(SENTENCES_SCHEMA)
+    cursor.execute(SENTENCES_FTS_SCHEMA)
+    cursor.execute(WORD_SENTENCES_SCHEMA)
+    cursor.execute(WORD_EXAMPLES_SCHEMA)
+    cursor.execute(SENTENCE_SHUFFLE_SCHEMA)
+
+    cursor.executemany('''
+        INSERT INTO sentences (id, turkish_id, turkish_text, english_id, english_text, difficulty_level)
+        VALUES (?, ?, ?, ?, ?, ?)
+    ''', sentences)
+    cursor.executemany('INSERT INTO word_sentences VALUES (?, ?, ?)', word_links)
+    cursor.executemany('INSERT INTO word_examples VALUES (?, ?, ?)', examples)
+    cursor.executemany('INSERT INTO sentence_shuffle VALUES (?, ?, ?)', shuffle_keys)
+
+    for statement in SENTENCE_INDEXES:
+        cursor.execute(statement)
+    build_fts_index(cursor)
+    write_level_stats(cursor)
+
+    cursor.execute('COMMIT')
+    conn.close()
+
+    if compact:
+        compact_sentences_database(shard_path)
+
+    return {
+        'level': level,
+        'file': shard_path,
+        'rows': len(sentences),
+        'bytes': os.path.getsize(shard_path),
+        'sha256': file_sha256(shard_path),
+    }
+
+def create_sentence_shards(db_path='sentences.db', jobs=None, manifest_path=SHARD_MANIFEST, compact=False):
+    """Split sentences.db into per-level shards plus a JSON manifest for on-demand download.
+
+    Rows keep their sentences.db ids. word_examples rows are copied for the
+    shard's own sentences, so a shard's ranks can have gaps.
+    """
+    print(f"\n🧩 Sharding {db_path} by difficulty level...")
+    started = time.perf_counter()
+
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+
+    # One pass over each source table, bucketing rows by sentence level
+    shards = {}
+    sentence_levels = {}
+    cursor.execute('''
+        SELECT id, turkish_id, turkish_text, english_id, english_text, difficulty_level
+        FROM sentences ORDER BY id
+    ''')
+    for row in cursor:
+        sentence_levels[row[0]] = row[5]
+        shards.setdefault(row[5], ([], [], [], []))[0].append(row)
+
+    cursor.execute('SELECT vocab_id, sentence_id, token_pos FROM word_sentences')
+    for link in cursor:
+        shards[sentence_levels[link[1]]][1].append(link)
+
+    cursor.execute('SELECT vocab_id, rank, sentence_id FROM word_examples')
+    for example in cursor:
+        shards[sentence_levels[example[2]]][2].append(example)
+
+    cursor.execute('SELECT difficulty_level, shuffle_key, sentence_id FROM sentence_shuffle')
+    for shuffle_key in cursor:
+        shards[shuffle_key[0]][3].append(shuffle_key)
+
+    conn.close()
+
+    levels = sorted(shards, key=lambda level: LEVEL_INDEX.get(level, len(CEFR_LEVELS)))
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        entries = list(executor.map(_build_shard, [(level,) + shards[level] + (compact,) for level in levels]))
+
+    manifest = {
+        'generated_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'source': os.path.basename(db_path),
+        'total_rows': sum(entry['rows'] for entry in entries),
+        'shards': entries,
+    }
+    with open(manifest_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+        f.write('\n')
+
+    report_phase('shards', manifest['total_rows'], time.perf_counter() - started)
+    for entry in entries:
+        print(f"  ✅ {entry['file']}: {entry['rows']:,} sentences, {entry['bytes'] / (1024 * 1024):.1f} MB")
+    print(f"📄 Manifest written to {manifest_path}")
+
+    return manifest_path
+
+def is_compact_database(cursor):
+    """True if sentences uses the --compact schema"""
+    cursor.execute('PRAGMA table_info(sentences)')
+    return 'created_at' not in {column[1] for column in cursor.fetchall()}
+
+def report_size_breakdown(cursor):
+    """Print the bytes used by each table and index, largest first (via dbstat)"""
+    try:
+        cursor.execute('''
+            SELECT name, COUNT(*), SUM(pgsize), SUM(payload), SUM(unused)
+            FROM dbstat GROUP BY name ORDER BY SUM(pgsize) DESC
+        ''')
+    except sqlite3.OperationalError:
+        print("⚠️  SQLite built without dbstat, skipping size breakdown")
+        return
+
+    print(f"  {'object':<28} {'pages':>8} {'bytes':>13} {'payload':>13} {'unused':>11}")
+    for name, pages, size, payload, unused in cursor.fetchall():
+        print(f"  {name:<28} {pages:>8,} {size:>13,} {payload:>13,} {unused:>11,}")
+
+def compact_sentences_database(db_path='sentences.db'):
+    """Rewrite a sentences database with the --compact storage profile.
+
+    Drops created_at and the always-zero is_favorite, stores difficulty_level
+    as its CEFR_LEVELS index in sentences, sentence_shuffle and
+    sentence_level_stats, drops the B-tree indexes over full sentence
+    text (LIKE ... COLLATE NOCASE can't use them; sentences_fts serves text
+    search) and normalization.py's dedup state, then VACUUMs at
+    COMPACT_PAGE_SIZE and runs ANALYZE.
+
+    App queries must filter on the index: difficulty_level = 0 for A1, not
+    difficulty_level = 'A1', which matches nothing on a compact database.
+    """
+    print(f"\n🗜️  Compacting {db_path}...")
+    size_before = os.path.getsize(db_path)
+
+    conn = sqlite3.connect(db_path)
+    conn.isolation_level = None
+    cursor = conn.cursor()
+
+    if is_compact_database(cursor):
+        print("  Already compact")
+        conn.close()
+        return db_path
+
+    started = time.perf_counter()
+    level_case = ' '.join(f"WHEN '{level}' THEN {index}" for level, index in LEVEL_INDEX.items())
+
+    cursor.execute('BEGIN')
+    cursor.execute("SELECT seq FROM sqlite_sequence WHERE name = 'sentences'")
+    sequence = cursor.fetchone()
+    cursor.execute(COMPACT_SENTENCES_SCHEMA)
+    cursor.execute(f'''
+        INSERT INTO sentences_compact (id, turkish_id, turkish_text, english_id, english_text, difficulty_level)
+        SELECT id, turkish_id, turkish_text, english_id, english_text, CASE difficulty_level {level_case} END
+        FROM sentences ORDER BY id
+    ''')
+    rows = cursor.rowcount
+    cursor.execute('DROP TABLE sentences')
+    cursor.execute('ALTER TABLE sentences_compact RENAME TO sentences')
+
+    for table, schema, columns in [('sentence_shuffle', COMPACT_SENTENCE_SHUFFLE_SCHEMA, 'shuffle_key, sentence_id'),
+                                   ('sentence_level_stats', COMPACT_LEVEL_STATS_SCHEMA, 'sentence_count')]:
+        cursor.execute(schema)
+        cursor.execute(f'''
+            INSERT INTO {table}_compact (difficulty_level, {columns})
+            SELECT CASE difficulty_level {level_case} END, {columns} FROM {table}
+        ''')
+        cursor.execute(f'DROP TABLE {table}')
+        cursor.execute(f'ALTER TABLE {table}_compact RENAME TO {table}')
+    cursor.execute('DROP TABLE IF EXISTS sentence_dedup')
+    cursor.execute('DROP TABLE IF EXISTS dedup_state')
+    cursor.execute('DROP TABLE IF EXISTS sentence_tombstones')
+    if sequence:
+        cursor.execute("UPDATE sqlite_sequence SET seq = ? WHERE name = 'sentences'", sequence)
+    cursor.execute('COMMIT')
+    report_phase('compact rewrite', rows, time.perf_counter() - started)
+
+    vacuum_started = time.perf_counter()
+    cursor.execute(f'PRAGMA page_size = {COMPACT_PAGE_SIZE}')
+    cursor.execute('VACUUM')
+    cursor.execute('ANALYZE')
+    report_phase('vacuum + analyze', rows, time.perf_counter() - vacuum_started)
+
+    size_after = os.path.getsize(db_path)
+    print(f"💾 {size_before / (1024 * 1024):.2f} MB -> {size_after / (1024 * 1024):.2f} MB "
+          f"({(1 - size_after / size_before) * 100:.1f}% smaller, page size {COMPACT_PAGE_SIZE})")
+    report_size_breakdown(cursor)
+
+    conn.close()
+    return db_path
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Generate SQLite databases for iOS app bundle')
+    parser.add_argument('--bulk-load', action='store_true',
+                        help='Build sentences.db in one transaction with journaling and sync disabled')
+    parser.add_argument('--jobs', type=int, default=None,
+                        help='Worker processes for tokenizing sentences (default: CPU count)')
+    parser.add_argument('--difficulty', choices=['vocabulary', 'length'], default='vocabulary',
+                        help='Sentence difficulty from Oxford token levels (default) or Turkish word count')
+    parser.add_argument('--tsv', default=TSV_FILENAME,
+                        help='Tatoeba Turkish-English TSV dump to load')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Apply the TSV to the existing sentences.db instead of rebuilding it')
+    parser.add_argument('--shards', action='store_true',
+                        help=f'Also write per-level {SHARD_FILENAME.format(level="<level>")} files and {SHARD_MANIFEST}')
+    parser.add_argument('--compact', action='store_true',
+                        help='Ship-size profile: drop unused columns and text indexes, VACUUM, ANALYZE')
+    parser.add_argument('--zstd', action='store_true',
+                        help=f'Also write {ZSTD_DB_PATH} with zstd dictionary-compressed text and benchmark it')
+    parser.add_argument('--reshuffle', action='store_true',
+                        help='Only rotate the random-draw order of an existing sentences.db')
+    parser.add_argument('--seed', type=int, default=None,
+                        help=f'Shuffle seed for a full build (default: {DEFAULT_SHUFFLE_SEED}) or --reshuffle '
+                             '(default: random); --incremental keeps the stored one')
+    return parser.parse_args()
+
 def main():
-    ////print("🚀 Generating SQLite databases for iOS app...")
-    ////print("=" * 60)
+    args = parse_args()
+
+    seed = args.seed if args.seed is not None else DEFAULT_SHUFFLE_SEED
+
+    if args.reshuffle:
+        reshuffle_sentences(seed=args.seed)
+        return
+
+    if args.incremental:
+        sentences_db = update_sentences_database(args.tsv, jobs=args.jobs, difficulty=args.difficulty)
+        if sentences_db and args.shards:
+            create_sentence_shards(sentences_db, jobs=args.jobs)
+        return
+
+    print("🚀 Generating SQLite databases for iOS app...")
+    print("=" * 60)
 
     try:
         # Create vocabulary database
         vocab_db = create_vocabulary_database()
 
         # Create sentences database
-        sentences_db = create_sentences_database()
+        sentences_db = create_sentences_database(
+            args.tsv,
+            bulk_load=args.bulk_load,
+            jobs=args.jobs,
+            seed=seed,
+            difficulty=args.difficulty
+        )
+
+        if sentences_db and args.shards:
+            create_sentence_shards(sentences_db, jobs=args.jobs, compact=args.compact)
+
+        if sentences_db and args.zstd:
+            create_zstd_database(sentences_db)
+            benchmark_zstd_database(sentences_db)
+
+        if sentences_db and args.compact:
+            compact_sentences_database(sentences_db)
 
-        ////print("\n" + "=" * 60)
-        ////print("🎉 Database generation completed!")
-        ////print("\n📦 Generated files:")
+        print("\n" + "=" * 60)
+        print("🎉 Database generation completed!")
+        print("\n📦 Generated files:")
         if vocab_db and os.path.exists(vocab_db):
-            ////print(f"  ✅ {vocab_db} ({os.path.getsize(vocab_db) / 1024:.1f} KB)")
+            print(f"  ✅ {vocab_db} ({os.path.getsize(vocab_db) / 1024:.1f} KB)")
         if sentences_db and os.path.exists(sentences_db):
-            ////print(f"  ✅ {sentences_db} ({os.path.getsize(sentences_db) / (1024*1024):.1f} MB)")
+            print(f"  ✅ {sentences_db} ({os.path.getsize(sentences_db) / (1024*1024):.1f} MB)")
 
-        ////print("\n📋 Next steps:")
-        ////print("  1. Add these .db files to your Xcode project")
-        ////print("  2. Set 'Copy Bundle Resources' in Build Phases")
-        ////print("  3. On first launch, copy from Bundle to Documents directory")
-        ////print("  4. Use SwiftData to query the databases")
+        print("\n📋 Next steps:")
+        print("  1. Add these .db files to your Xcode project")
+        print("  2. Set 'Copy Bundle Resources' in Build Phases")
+        print("  3. On first launch, copy from Bundle to Documents directory")
+        print("  4. Use SwiftData to query the databases")
 
     except Exception as e:
-        ////print(f"\n❌ Fatal error: {e}")
+        print(f"\n❌ Fatal error: {e}")
         import traceback
         traceback.print_exc()
 
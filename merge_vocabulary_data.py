@@ -5,8 +5,14 @@ Creates a comprehensive vocabulary database with levels.
 """
 
 import csv
+import os
 import pandas as pd
 
+# All (word, pos, level) triples from parse_oxford_layout.py; the older
+# parsers' one-level-per-word CSV is used when it is missing
+POS_LEVELS_CSV = 'oxford3000_word_pos_levels.csv'
+WORD_LEVELS_CSV = 'oxford3000_word_levels.csv'
+
 def load_csv_with_encoding(filepath):
     """Try different encodings to load CSV"""
     encodings = ['utf-8', 'utf-8-sig', 'latin-1', 'iso-8859-1', 'cp1252']
@@ -14,12 +20,12 @@ def load_csv_with_encoding(filepath):
     for encoding in encodings:
         try:
             df = pd.read_csv(filepath, encoding=encoding)
-            ////print(f"✅ Loaded {filepath} with {encoding} encoding")
+            print(f"✅ Loaded {filepath} with {encoding} encoding")
             return df
         except UnicodeDecodeError:
             continue
         except Exception as e:
-            ////print(f"❌ Error with {encoding}: {e}")
+            print(f"❌ Error with {encoding}: {e}")
             continue
 
     raise ValueError(f"Could not load {filepath} with any encoding")
@@ -27,19 +33,23 @@ def load_csv_with_encoding(filepath):
 def merge_vocabulary_data():
     """Merge vocabulary CSV with word levels"""
 
-    ////print("📚 Loading vocabulary dataset...")
+    print("📚 Loading vocabulary dataset...")
     vocab_df = load_csv_with_encoding('oxford3000_vocabulary_with_collocations_and_definitions_datasets.csv')
 
-    ////print("📊 Loading word levels...")
-    levels_df = load_csv_with_encoding('oxford3000_word_levels.csv')
+    print("📊 Loading word levels...")
+    levels_path = POS_LEVELS_CSV if os.path.exists(POS_LEVELS_CSV) else WORD_LEVELS_CSV
+    levels_df = load_csv_with_encoding(levels_path)
 
-    ////print(f"\n📈 Initial counts:")
-    ////print(f"  Vocabulary entries: {len(vocab_df)}")
-    ////print(f"  Word levels: {len(levels_df)}")
+    print(f"\n📈 Initial counts:")
+    print(f"  Vocabulary entries: {len(vocab_df)}")
+    print(f"  Word levels: {len(levels_df)} ({levels_path})")
 
     # Normalize word columns for matching
     vocab_df['word_normalized'] = vocab_df['Word'].str.lower().str.strip()
     levels_df['word_normalized'] = levels_df['word'].str.lower().str.strip()
+    # One level per word for the vocabulary.level column: the first one listed,
+    # as before. Every POS level goes to vocabulary_levels in the generator.
+    levels_df = levels_df.drop_duplicates(subset='word_normalized', keep='first')
 
     # Merge on normalized word
     merged_df = vocab_df.merge(
@@ -71,34 +81,34 @@ def merge_vocabulary_data():
     output_file = 'vocabulary_with_levels.csv'
     merged_df.to_csv(output_file, index=False, encoding='utf-8')
 
-    ////print(f"\n✅ Merged data saved to {output_file}")
-    ////print(f"📊 Total vocabulary entries: {len(merged_df)}")
+    print(f"\n✅ Merged data saved to {output_file}")
+    print(f"📊 Total vocabulary entries: {len(merged_df)}")
 
     # Statistics
     level_counts = merged_df['level'].value_counts().sort_index()
-    ////print("\n📊 Level distribution in vocabulary:")
+    print("\n📊 Level distribution in vocabulary:")
     for level in ['A1', 'A2', 'B1', 'B2', 'Unknown']:
         count = level_counts.get(level, 0)
         if count > 0:
-            ////print(f"  {level}: {count:4d} words")
+            print(f"  {level}: {count:4d} words")
 
     # Check match rate
     matched = merged_df['level'].notna().sum()
     match_rate = (matched / len(merged_df)) * 100
-    ////print(f"\n✨ Match rate: {match_rate:.1f}% ({matched}/{len(merged_df)} words matched with levels)")
+    print(f"\n✨ Match rate: {match_rate:.1f}% ({matched}/{len(merged_df)} words matched with levels)")
 
     # Show sample
-    ////print("\n📝 Sample merged data (first 10 rows):")
-    ////print(merged_df[['word', 'level', 'part_of_speech', 'turkish_translation']].head(10).to_string(index=False))
+    print("\n📝 Sample merged data (first 10 rows):")
+    print(merged_df[['word', 'level', 'part_of_speech', 'turkish_translation']].head(10).to_string(index=False))
 
     return merged_df
 
 def main():
     try:
         merged_df = merge_vocabulary_data()
-        ////print("\n🎉 Merge completed successfully!")
+        print("\n🎉 Merge completed successfully!")
     except Exception as e:
-        ////print(f"\n❌ Error: {e}")
+        print(f"\n❌ Error: {e}")
         import traceback
         traceback.print_exc()
 
@@ -1,22 +1,174 @@
+import argparse
+import hashlib
+import json
+import os
+import resource
 import sqlite3
 import re
+import sys
+import time
+from array import array
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
 import Levenshtein  # Library for fast string comparison
+import numpy as np
 from tqdm import tqdm # Library for progress bar (optional, pip install tqdm)
 
+from generate_sqlite_databases import (assign_shuffle_keys, count_english_tokens, create_word_examples,
+                                       load_shuffle_seed, write_level_stats)
+
 # --- CONFIGURATION ---
 DB_PATH = 'sentences.db' # REPLACE with your actual file path
+VOCAB_DB_PATH = 'vocabulary.db'
 TABLE_NAME = 'sentences'
 COLUMN_TEXT = 'english_text'
+COLUMN_TURKISH = 'turkish_text'
 COLUMN_ID = 'id'
 
-# Similarity threshold (0.0 to 1.0). 
+# What a row is deduplicated on: the English side only, or both sides of the
+# pair, so two rows with the same English text but different Turkish
+# translations are kept apart. Pair texts are stored as "english turkish";
+# neither normalized side contains the separator, so equal pair texts (and
+# hashes) mean both sides are equal, and a fuzzy match needs each side's
+# ratio to reach SIMILARITY_THRESHOLD on its own (the reported ratio is the
+# lower of the two).
+DEDUP_SIDES = ['english', 'pair']
+PAIR_SEPARATOR = ' '
+
+# Turkish casefolding: I -> ı and İ -> i before lowercasing, circumflexes dropped
+TURKISH_CASEFOLD = str.maketrans({'I': 'ı', 'İ': 'i', 'â': 'a', 'Â': 'a', 'î': 'i', 'Î': 'i', 'û': 'u', 'Û': 'u'})
+# ASCII plus one byte per Turkish letter, so shingles and edit distances
+# count Turkish letters as single characters
+TEXT_ENCODING = 'iso8859_9'
+
+# Similarity threshold (0.0 to 1.0).
 # 0.90 catches "dog" vs "dogs".
 # 0.85 might catch "my books" vs "our books" but requires manual checking to be safe.
-SIMILARITY_THRESHOLD = 0.90 
+SIMILARITY_THRESHOLD = 0.90
+
+# Candidate generation: MinHash over character shingles + LSH banding.
+# A pair becomes a candidate if all LSH_ROWS_PER_BAND hashes of any one band
+# agree, so pairs are found wherever they differ ("I love dogs" vs "We love
+# dogs"), not only when they sort next to each other.
+# With 20 bands of 5 rows a pair with shingle Jaccard 0.67 is found ~95% of
+# the time, while unrelated pairs (Jaccard ~0.1) almost never collide.
+SHINGLE_SIZE = 3
+LSH_BANDS = 20
+LSH_ROWS_PER_BAND = 5
+MINHASH_SEED = 1
+
+# Buckets bigger than this (very common short sentences) only pair each
+# member with its next MAX_BUCKET_SIZE members in sorted order
+MAX_BUCKET_SIZE = 200
+
+# Lossless prefilters run before the ratio is scored. ratio is
+# 1 - indel_distance / (l1 + l2), so a match needs an indel distance of at most
+# d = (1 - SIMILARITY_THRESHOLD) * (l1 + l2). That rules out pairs whose
+# lengths differ by more than d, and pairs sharing fewer than
+# max(l1, l2) - q + 1 - q * d q-grams (one edit touches at most q of them).
+# Shared q-grams are bounded from above by hashing each text's q-grams into
+# QGRAM_BINS counters, so the filter never drops a real match.
+QGRAM_SIZE = 2
+QGRAM_BINS = 64
+
+# Exact duplicates are resolved in SQL before any fuzzy matching: every row's
+# normalized text (encoded, computed once and reused by the fuzzy stage) and
+# its 64-bit hash go to a temp table, and all but the longest row of each
+# hash group go to temp_delete
+NORMALIZED_HASH_SCHEMA = '''
+    CREATE TEMP TABLE temp_normalized (
+        id INTEGER PRIMARY KEY,
+        normalized_text BLOB NOT NULL,
+        text_hash INTEGER,
+        text_length INTEGER NOT NULL
+    )
+'''
+DELETE_IDS_SCHEMA = '''
+    CREATE TEMP TABLE temp_delete (
+        id INTEGER PRIMARY KEY,
+        kept_id INTEGER NOT NULL,
+        reason TEXT NOT NULL,
+        ratio REAL
+    )
+'''
+
+# Incremental runs: every row that survived a dedup run keeps its normalized
+# text, hash and LSH band keys in sentence_dedup, and dedup_state records the
+# "last deduped" watermark. The next run only compares rows without state
+# (new rows, and rows the generator's --incremental update rewrote) against
+# them. Rows that already have state are never deleted by an incremental run.
+DEDUP_SCHEMA = [
+    '''
+    CREATE TABLE IF NOT EXISTS sentence_dedup (
+        id INTEGER PRIMARY KEY,
+        normalized_text TEXT NOT NULL,
+        text_hash INTEGER NOT NULL,
+        band_keys BLOB NOT NULL
+    )
+    ''',
+    'CREATE INDEX IF NOT EXISTS idx_sentence_dedup_hash ON sentence_dedup(text_hash)',
+    '''
+    CREATE TABLE IF NOT EXISTS dedup_state (
+        key TEXT PRIMARY KEY,
+        value
+    ) WITHOUT ROWID
+    ''',
+]
+# Stored band keys are only comparable while these settings (and the dedup
+# sides) are unchanged
+LSH_CONFIG = f'{SHINGLE_SIZE}:{LSH_BANDS}x{LSH_ROWS_PER_BAND}:{MINHASH_SEED}'
+
+# One JSON line per deleted row: its id, the id it duplicates, why, and both texts
+REPORT_PATH = 'dedup_report.jsonl'
+
+# Generator tables holding one row per sentence occurrence, cleaned up with
+# the sentence. word_examples, sentence_shuffle and sentence_level_stats are
+# re-derived from the surviving rows instead (refresh_derived_tables), so
+# ranks stay filled and shuffle keys stay dense.
+DEPENDENT_TABLES = [
+    ('word_sentences', 'sentence_id'),
+]
 
-# How many neighbors to check? 
-# Sorting puts similar sentences near each other. Checking 10 neighbors covers most gaps.
-WINDOW_SIZE = 10 
+# Deleted ids keep resolving: the app looks a stale id up here and gets the
+# canonical sentence of its duplicate cluster instead
+REDIRECTS_SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS sentence_redirects (
+        old_id INTEGER PRIMARY KEY,
+        canonical_id INTEGER NOT NULL
+    )
+'''
+
+# Tatoeba keys of deleted rows. The generator's --incremental update skips
+# these pairs, so rows removed here aren't re-inserted from the next dump
+TOMBSTONES_SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS sentence_tombstones (
+        turkish_id INTEGER NOT NULL,
+        english_id INTEGER NOT NULL,
+        PRIMARY KEY (turkish_id, english_id)
+    ) WITHOUT ROWID
+'''
+
+# Candidate pairs handed to a verification worker at a time
+VERIFY_CHUNK_SIZE = 50000
+
+# Memory: rows are streamed from the cursor in batches into flat arrays
+# (ids and one buffer of normalized text) instead of a dict per row,
+# and signatures are computed a block of texts at a time.
+FETCH_BATCH_SIZE = 10000
+MINHASH_BLOCK_SIZE = 50000
+# Normalized texts are sorted on their first SORT_PREFIX_BYTES bytes with
+# NumPy; only ties on that prefix fall back to comparing the full text
+SORT_PREFIX_BYTES = 32
+
+# ratio is scored with a bit-parallel LCS kernel (one uint64 word per text)
+# over blocks of pairs; texts longer than the word fall back to Levenshtein.ratio
+BITPARALLEL_WORD_BITS = 64
+BITPARALLEL_BLOCK_SIZE = 2048
+# With a threshold, pairs that can no longer reach it are dropped every this many bytes
+BITPARALLEL_CHECK_INTERVAL = 8
+# Rows sampled from DB_PATH by --benchmark-kernel
+BENCHMARK_SAMPLE_ROWS = 50000
 # ---------------------
 
 def normalize_text(text):
@@ -28,104 +180,861 @@ def normalize_text(text):
         return ""
     return re.sub(r'[^a-z0-9]', '', text.lower())
 
-def clean_database():
-    conn = sqlite3.connect(DB_PATH)
+def normalize_turkish(text):
+    """
+    Turkish-aware casefold, keeping letters and digits.
+    Example: "İyi akşamlar, Işık!" -> "iyiakşamlarışık"
+    """
+    if not text:
+        return ""
+    return re.sub(r'[^a-z0-9çğıöşü]', '', text.translate(TURKISH_CASEFOLD).lower())
+
+def dedup_text(english, turkish, sides='english'):
+    """The normalized text a row is deduplicated on"""
+    if sides == 'pair':
+        return normalize_text(english) + PAIR_SEPARATOR + normalize_turkish(turkish)
+    return normalize_text(english)
+
+def text_digest(data):
+    """64-bit hash of an encoded normalized text, stable across runs (unlike hash())"""
+    digest = hashlib.blake2b(data, digest_size=8).digest()
+    return int.from_bytes(digest, 'big', signed=True)
+
+def text_length_sql(sides='english', table=TABLE_NAME):
+    """SQL length of the original text, used to prefer the longest row"""
+    if sides == 'pair':
+        return f"LENGTH({table}.{COLUMN_TEXT}) + LENGTH({table}.{COLUMN_TURKISH})"
+    return f"LENGTH({table}.{COLUMN_TEXT})"
+
+def shingle_codes(buffer, starts, ends, shingle_size):
+    """
+    Integer code of every character shingle of the texts buffer[starts:ends],
+    plus the offset of each text's first shingle. Runs as whole-array NumPy
+    operations instead of a Python loop per row.
+    """
+    buffer = np.frombuffer(buffer, dtype=np.uint8)
+
+    # Texts shorter than a shingle become a single shingle padded with spaces
+    shingle_counts = np.maximum(ends - starts - shingle_size + 1, 1)
+    shingle_starts = np.concatenate(([0], np.cumsum(shingle_counts)[:-1]))
+    offsets_in_text = np.arange(shingle_counts.sum()) - np.repeat(shingle_starts, shingle_counts)
+    positions = np.repeat(starts, shingle_counts) + offsets_in_text
+    text_ends = np.repeat(ends, shingle_counts)
+    codes = np.zeros(len(positions), dtype=np.uint64)
+    for offset in range(shingle_size):
+        inside = positions + offset < text_ends
+        chars = np.where(inside, buffer[np.minimum(positions + offset, len(buffer) - 1)], ord(' '))
+        codes = (codes << np.uint64(8)) | chars.astype(np.uint64)
+
+    # Spread the codes before they are hashed or binned
+    codes *= np.uint64(0x9E3779B97F4A7C15)
+    return codes, shingle_starts
+
+def minhash_signatures(buffer, starts, ends, shingle_size=SHINGLE_SIZE,
+                       num_perm=LSH_BANDS * LSH_ROWS_PER_BAND, seed=MINHASH_SEED):
+    """MinHash signature matrix (len(starts) x num_perm) over character shingles."""
+    rng = np.random.default_rng(seed)
+    multipliers = rng.integers(1, 2**63, size=num_perm, dtype=np.uint64) | np.uint64(1)
+    increments = rng.integers(0, 2**63, size=num_perm, dtype=np.uint64)
+
+    signatures = np.empty((len(starts), num_perm), dtype=np.uint32)
+    for block in range(0, len(starts), MINHASH_BLOCK_SIZE):
+        block_slice = slice(block, block + MINHASH_BLOCK_SIZE)
+        codes, shingle_starts = shingle_codes(buffer, starts[block_slice], ends[block_slice], shingle_size)
+        for p in range(num_perm):
+            hashed = (codes * multipliers[p] + increments[p]) >> np.uint64(32)
+            signatures[block_slice, p] = np.minimum.reduceat(hashed, shingle_starts)
+    return signatures
+
+def qgram_histograms(buffer, starts, ends, q=QGRAM_SIZE, bins=QGRAM_BINS):
+    """Per-text q-gram counts hashed into bins (len(starts) x bins)."""
+    codes, shingle_starts = shingle_codes(buffer, starts, ends, q)
+    owners = np.repeat(np.arange(len(starts)), np.diff(np.r_[shingle_starts, len(codes)]))
+    binned = (codes >> np.uint64(58)).astype(np.int64) % bins
+    counts = np.bincount(owners * bins + binned, minlength=len(starts) * bins)
+    return counts.reshape(len(starts), bins).astype(np.uint16)
+
+def prefix_words(buffer, starts, ends, prefix_bytes=SORT_PREFIX_BYTES):
+    """
+    The first prefix_bytes bytes of every text as big-endian uint64 words,
+    zero-padded, so comparing the words compares the texts' prefixes.
+    """
+    buffer = np.frombuffer(buffer, dtype=np.uint8)
+    words = []
+    for word_start in range(0, prefix_bytes, 8):
+        positions = starts[:, None] + np.arange(word_start, word_start + 8)
+        chars = np.where(positions < ends[:, None], buffer[np.minimum(positions, len(buffer) - 1)], 0)
+        words.append(chars.astype(np.uint8).view('>u8').ravel().astype(np.uint64))
+    return words
+
+def sort_texts(buffer, starts, ends):
+    """
+    Index array that sorts buffer[starts:ends] lexicographically, stable
+    (equal texts keep their fetch order).
+    """
+    words = prefix_words(buffer, starts, ends)
+    order = np.lexsort(words[::-1])
+    sorted_words = [word[order] for word in words]
+    sorted_lengths = (ends - starts)[order]
+
+    # Runs that agree on the whole prefix; only runs holding a longer text
+    # need a full comparison, done in Python on just that run
+    same_prefix = np.ones(len(order) - 1, dtype=bool) if len(order) else np.zeros(0, dtype=bool)
+    for word in sorted_words:
+        same_prefix &= word[1:] == word[:-1]
+    run_starts = np.flatnonzero(np.r_[True, ~same_prefix])
+    run_ends = np.r_[run_starts[1:], len(order)]
+    for run_start, run_end in zip(run_starts, run_ends):
+        if run_end - run_start > 1 and sorted_lengths[run_start:run_end].max() > SORT_PREFIX_BYTES:
+            run = order[run_start:run_end].tolist()
+            order[run_start:run_end] = sorted(run, key=lambda k: buffer[starts[k]:ends[k]])
+    return order
+
+def lsh_band_keys(signatures, bands=LSH_BANDS, rows_per_band=LSH_ROWS_PER_BAND):
+    """One 32-bit bucket key per LSH band (len(signatures) x bands)."""
+    rng = np.random.default_rng(MINHASH_SEED)
+    mixers = rng.integers(1, 2**63, size=rows_per_band, dtype=np.uint64) | np.uint64(1)
+
+    keys = np.empty((len(signatures), bands), dtype=np.uint32)
+    for band in range(bands):
+        columns = signatures[:, band * rows_per_band:(band + 1) * rows_per_band].astype(np.uint64)
+        keys[:, band] = (columns * mixers).sum(axis=1) >> np.uint64(32)
+    return keys
+
+def lsh_candidate_pairs(band_keys):
+    """
+    Unique (i, j) row pairs, i < j, that share a bucket in at least one band,
+    sorted by i then j.
+    """
+    n = len(band_keys)
+    pair_keys = []
+    for band in range(band_keys.shape[1]):
+        keys = band_keys[:, band]
+
+        # Rows are already in sorted-text order; a stable sort keeps that inside each bucket
+        order = np.argsort(keys, kind='stable')
+        sorted_keys = keys[order]
+        run_starts = np.flatnonzero(np.r_[True, sorted_keys[1:] != sorted_keys[:-1]])
+        run_ends = np.r_[run_starts[1:], n]
+
+        for start, end in zip(run_starts[run_ends - run_starts > 1], run_ends[run_ends - run_starts > 1]):
+            members = order[start:end]
+            for k in range(len(members) - 1):
+                partners = members[k + 1:k + 1 + MAX_BUCKET_SIZE]
+                pair_keys.append(members[k] * n + partners)
+
+    if not pair_keys:
+        return np.zeros((0, 2), dtype=np.int64)
+    unique_keys = np.unique(np.concatenate(pair_keys))
+    return np.column_stack((unique_keys // n, unique_keys % n))
+
+def cross_candidate_pairs(existing_keys, new_keys):
+    """
+    Unique (existing, new) row pairs that share a bucket in at least one band.
+    Each new row is paired with at most MAX_BUCKET_SIZE existing rows per band.
+    """
+    n = len(new_keys)
+    pair_keys = []
+    for band in range(new_keys.shape[1]):
+        order = np.argsort(existing_keys[:, band], kind='stable')
+        sorted_keys = existing_keys[order, band]
+        lo = np.searchsorted(sorted_keys, new_keys[:, band], side='left')
+        hi = np.minimum(np.searchsorted(sorted_keys, new_keys[:, band], side='right'), lo + MAX_BUCKET_SIZE)
+
+        counts = hi - lo
+        new_rows = np.repeat(np.arange(n), counts)
+        offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        pair_keys.append(order[np.repeat(lo, counts) + offsets] * n + new_rows)
+
+    unique_keys = np.unique(np.concatenate(pair_keys)) if pair_keys else np.zeros(0, dtype=np.int64)
+    return np.column_stack((unique_keys // n, unique_keys % n))
+
+_clean_buffer = None
+_clean_starts = None
+_clean_ends = None
+_side_splits = None
+_text_lengths = None
+_qgram_histograms = None
+
+def byte_codes(buffer):
+    """Map every byte of the buffer to a dense code (0..alphabet-1) for the PM tables"""
+    data = np.frombuffer(buffer, dtype=np.uint8)
+    present = np.flatnonzero(np.bincount(data, minlength=256))
+    codes = np.zeros(256, dtype=np.int64)
+    codes[present] = np.arange(len(present))
+    return codes[data], len(present)
+
+def popcount(words):
+    """Set bits of every uint64; np.bitwise_count needs NumPy >= 2.0, so older NumPy counts with SWAR"""
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(words)
+    words = words - ((words >> np.uint64(1)) & np.uint64(0x5555555555555555))
+    words = (words & np.uint64(0x3333333333333333)) + ((words >> np.uint64(2)) & np.uint64(0x3333333333333333))
+    words = (words + (words >> np.uint64(4))) & np.uint64(0x0F0F0F0F0F0F0F0F)
+    return (words * np.uint64(0x0101010101010101)) >> np.uint64(56)
+
+def edit_ratios(buffer, starts, ends, pairs, encoded=None, threshold=None, block_size=BITPARALLEL_BLOCK_SIZE):
+    """
+    Levenshtein.ratio for every (i, j) pair, computed in NumPy.
+    ratio is 1 - indel distance / total length and the indel distance is
+    la + lb - 2 * LCS, so the kernel is the bit-parallel LCS (Allison-Dix /
+    Hyyro): the shorter text sits in one uint64 word, each byte of the
+    longer one is one add/and/or step over a whole block of pairs. Pairs
+    are sorted by the longer length so finished pairs drop off the front.
+
+    With a threshold, pairs that can't reach it come back as 0.0 (like
+    Levenshtein.ratio's score_cutoff) and are dropped early: up front when
+    LCS <= la already rules them out, and every BITPARALLEL_CHECK_INTERVAL
+    bytes when the LCS so far plus the bytes left can't reach it.
+    Other results are identical to Levenshtein.ratio.
+    """
+    if encoded is None:
+        encoded, alphabet = byte_codes(buffer)
+    else:
+        encoded, alphabet = encoded
+    first, second = pairs[:, 0], pairs[:, 1]
+    first_lengths, second_lengths = ends[first] - starts[first], ends[second] - starts[second]
+    swap = first_lengths > second_lengths
+    short, long = np.where(swap, second, first), np.where(swap, first, second)
+    short_lengths = np.minimum(first_lengths, second_lengths)
+    long_lengths = np.maximum(first_lengths, second_lengths)
+    totals = short_lengths + long_lengths
+
+    # 2 * LCS must reach threshold * total; the slack keeps pairs landing exactly on it
+    if threshold is None:
+        needed = np.zeros(len(pairs))
+    else:
+        needed = threshold * totals - 1e-9
+    ratios = np.zeros(len(pairs))
+    reachable = 2 * short_lengths >= needed
+
+    fits = short_lengths <= BITPARALLEL_WORD_BITS
+    for k in np.flatnonzero(~fits & reachable).tolist():
+        ratios[k] = Levenshtein.ratio(buffer[starts[short[k]]:ends[short[k]]],
+                                      buffer[starts[long[k]]:ends[long[k]]], score_cutoff=threshold)
+
+    one = np.uint64(1)
+    order = np.flatnonzero(fits & reachable)
+    order = order[np.argsort(long_lengths[order], kind='stable')]
+    for block_start in range(0, len(order), block_size):
+        block = order[block_start:block_start + block_size]
+        la, lb = short_lengths[block], long_lengths[block]
+        short_starts, long_starts = starts[short[block]], starts[long[block]]
+        rows = np.arange(len(block)) * alphabet
+
+        # PM[pair, code]: bit p is set where the short text has that byte at p
+        pm = np.zeros(len(block) * alphabet, dtype=np.uint64)
+        for p in range(int(la.max(initial=0))):
+            active = np.flatnonzero(la > p)
+            pm[rows[active] + encoded[short_starts[active] + p]] |= one << np.uint64(p)
+
+        mask = np.where(la == 0, np.uint64(0), ~np.uint64(0) >> (np.uint64(64) - la.astype(np.uint64)))
+        block_needed = needed[block]
+        v = np.full(len(block), ~np.uint64(0), dtype=np.uint64)
+        u = np.empty_like(v)
+        w = np.empty_like(v)
+        for p in range(int(lb.max(initial=0))):
+            done = np.searchsorted(lb, p, side='right')
+            if threshold is not None and p and p % BITPARALLEL_CHECK_INTERVAL == 0:
+                # Drop unfinished pairs whose LCS can't reach the threshold any more
+                lcs = la[done:] - popcount(v[done:] & mask[done:]).astype(np.int64)
+                bound = np.minimum(la[done:], lcs + lb[done:] - p)
+                hopeless = 2 * bound < block_needed[done:]
+                if hopeless.any():
+                    keep = np.r_[np.ones(done, dtype=bool), ~hopeless]
+                    block, la, lb, mask, rows = block[keep], la[keep], lb[keep], mask[keep], rows[keep]
+                    long_starts, block_needed, v = long_starts[keep], block_needed[keep], v[keep]
+                    u, w = np.empty_like(v), np.empty_like(v)
+            vv, uu, ww = v[done:], u[done:], w[done:]
+            np.bitwise_and(vv, pm[rows[done:] + encoded[long_starts[done:] + p]], out=uu)
+            np.subtract(vv, uu, out=ww)
+            np.add(vv, uu, out=vv)
+            np.bitwise_or(vv, ww, out=vv)
+
+        lcs = la - popcount(v & mask).astype(np.int64)
+        total = la + lb
+        block_ratios = np.where(total > 0, 1.0 - (total - 2 * lcs) / np.maximum(total, 1), 1.0)
+        ratios[block] = np.where(2 * lcs >= block_needed, block_ratios, 0.0)
+    return ratios
+
+def side_splits(buffer, starts):
+    """Offset of the separator between the English and Turkish side of every pair text"""
+    separators = np.flatnonzero(np.frombuffer(buffer, dtype=np.uint8) == ord(PAIR_SEPARATOR))
+    return separators[np.searchsorted(separators, starts)]
+
+def dedup_ratios(buffer, starts, ends, pairs, splits=None, encoded=None, threshold=SIMILARITY_THRESHOLD):
+    """
+    Similarity of every (i, j) pair: the ratio of the whole text, or with
+    side splits (pair mode) the lower of the English and Turkish ratios.
+    Pairs below the threshold come back as 0.0 (see edit_ratios).
+    """
+    if splits is None:
+        return edit_ratios(buffer, starts, ends, pairs, encoded, threshold)
+    return np.minimum(edit_ratios(buffer, starts, splits, pairs, encoded, threshold),
+                      edit_ratios(buffer, splits + 1, ends, pairs, encoded, threshold))
+
+def _init_verify_worker(buffer, starts, ends, sides='english'):
+    global _clean_buffer, _clean_starts, _clean_ends, _side_splits, _text_lengths, _qgram_histograms, _byte_codes
+    _clean_buffer = buffer
+    _clean_starts = starts
+    _clean_ends = ends
+    _side_splits = side_splits(buffer, starts) if sides == 'pair' else None
+    _text_lengths = ends - starts
+    _qgram_histograms = qgram_histograms(buffer, starts, ends)
+    _byte_codes = byte_codes(buffer)
+
+def _verify_chunk(pairs):
+    """
+    Similarity ratio for a chunk of (i, j) candidate pairs.
+    Returns the (i, j, ratio) pairs at or above the threshold, in input order,
+    plus the worker pid, filter counters and busy time for the report.
+    """
+    started = time.perf_counter()
+    checked = len(pairs)
+
+    # Length filter; the small slack keeps pairs that land exactly on the threshold
+    first_lengths = _text_lengths[pairs[:, 0]]
+    second_lengths = _text_lengths[pairs[:, 1]]
+    max_distance = (1 - SIMILARITY_THRESHOLD) * (first_lengths + second_lengths) + 1e-9
+    keep = np.abs(first_lengths - second_lengths) <= max_distance
+    length_rejects = checked - int(keep.sum())
+    pairs = pairs[keep]
+
+    # q-gram count filter
+    required = (np.maximum(first_lengths[keep], second_lengths[keep]) - QGRAM_SIZE + 1
+                - QGRAM_SIZE * np.floor(max_distance[keep]).astype(np.int64))
+    shared = np.minimum(_qgram_histograms[pairs[:, 0]], _qgram_histograms[pairs[:, 1]]).sum(axis=1)
+    keep = shared >= required
+    qgram_rejects = len(pairs) - int(keep.sum())
+    pairs = pairs[keep]
+
+    # Both prefilters bound the whole text's ratio, which in pair mode is at
+    # least the lower side ratio, so they never drop a pair that matches on both sides
+    ratios = dedup_ratios(_clean_buffer, _clean_starts, _clean_ends, pairs, _side_splits, _byte_codes)
+    keep = ratios >= SIMILARITY_THRESHOLD
+    matches = list(zip(pairs[keep, 0].tolist(), pairs[keep, 1].tolist(), ratios[keep].tolist()))
+    stats = (checked, length_rejects, qgram_rejects, time.perf_counter() - started)
+    return matches, os.getpid(), stats
+
+def verify_candidates(buffer, starts, ends, candidates, jobs=None, sides='english'):
+    """
+    Score every candidate pair across worker processes.
+    Chunks come back in submission order, so the matches are in the same
+    sorted (i, j) order whatever the worker count.
+    """
+    chunks = [candidates[k:k + VERIFY_CHUNK_SIZE] for k in range(0, len(candidates), VERIFY_CHUNK_SIZE)]
+
+    matches = []
+    worker_stats = defaultdict(lambda: np.zeros(4))
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_verify_worker,
+                             initargs=(buffer, starts, ends, sides)) as executor:
+        for chunk_matches, pid, stats in tqdm(executor.map(_verify_chunk, chunks), total=len(chunks)):
+            matches.extend(chunk_matches)
+            worker_stats[pid] += stats
+
+    for pid, (checked, _, _, elapsed) in sorted(worker_stats.items()):
+        print(f"  worker {pid}: {checked:,.0f} pairs in {elapsed:.2f}s ({checked / max(elapsed, 1e-9):,.0f} pairs/sec)")
+
+    checked, length_rejects, qgram_rejects, _ = sum(worker_stats.values(), np.zeros(4))
+    print(f"  Rejected by length filter: {length_rejects:,.0f}")
+    print(f"  Rejected by q-gram filter: {qgram_rejects:,.0f}")
+    print(f"  Pairs scored:              {checked - length_rejects - qgram_rejects:,.0f}")
+    return matches
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS, kilobytes on Linux
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+def find_exact_duplicates(conn, sides='english'):
+    """
+    Stage 1: hash the normalized text of every row without dedup state and
+    fill temp_delete with the ones that repeat, either among themselves
+    (keeping the longest text of each group, the lowest id on a tie) or an
+    already-deduped row. Returns (duplicate groups, rows marked for deletion).
+    """
+    conn.create_function('dedup_text', 2,
+                         lambda english, turkish: dedup_text(english, turkish, sides).encode(TEXT_ENCODING),
+                         deterministic=True)
+    conn.create_function('text_digest', 1, text_digest, deterministic=True)
     cursor = conn.cursor()
+    cursor.execute(NORMALIZED_HASH_SCHEMA)
+    cursor.execute(DELETE_IDS_SCHEMA)
+    cursor.execute(f'''
+        INSERT INTO temp_normalized (id, normalized_text, text_length)
+        SELECT {COLUMN_ID}, dedup_text({COLUMN_TEXT}, {COLUMN_TURKISH}), {text_length_sql(sides)}
+        FROM {TABLE_NAME}
+        WHERE {COLUMN_ID} NOT IN (SELECT id FROM sentence_dedup)
+    ''')
+    cursor.execute('UPDATE temp_normalized SET text_hash = text_digest(normalized_text)')
+
+    cursor.execute('''
+        INSERT INTO temp_delete
+        SELECT id, (SELECT MIN(id) FROM sentence_dedup WHERE text_hash = temp_normalized.text_hash), 'exact', 1.0
+        FROM temp_normalized
+        WHERE text_hash IN (SELECT text_hash FROM sentence_dedup)
+    ''')
+    cursor.execute('''
+        INSERT OR IGNORE INTO temp_delete
+        SELECT id, kept_id, 'exact', 1.0 FROM (
+            SELECT id,
+                   ROW_NUMBER() OVER text_group AS group_rank,
+                   FIRST_VALUE(id) OVER text_group AS kept_id
+            FROM temp_normalized
+            WINDOW text_group AS (PARTITION BY text_hash ORDER BY text_length DESC, id)
+        )
+        WHERE group_rank > 1
+    ''')
+
+    cursor.execute('''
+        SELECT COUNT(*), COALESCE(SUM(group_size), 0) FROM (
+            SELECT COUNT(*) AS group_size FROM temp_normalized
+            WHERE id IN (SELECT id FROM temp_delete)
+            GROUP BY text_hash
+        )
+    ''')
+    return cursor.fetchone()
+
+def load_rows(cursor):
+    """
+    Stream the rows without dedup state that aren't already marked for
+    deletion into flat arrays: ids, and every normalized text packed into one
+    bytes buffer delimited by offsets. The texts come from temp_normalized,
+    so nothing is normalized twice.
+    """
+    ids = array('q')
+    offsets = array('q', [0])
+    buffer = bytearray()
+
+    cursor.execute('''
+        SELECT id, normalized_text FROM temp_normalized
+        WHERE id NOT IN (SELECT id FROM temp_delete)
+    ''')
+    while True:
+        rows = cursor.fetchmany(FETCH_BATCH_SIZE)
+        if not rows:
+            break
+        for sentence_id, normalized in rows:
+            ids.append(sentence_id)
+            buffer += normalized
+            offsets.append(len(buffer))
+
+    offsets = np.frombuffer(offsets, dtype=np.int64)
+    return np.frombuffer(ids, dtype=np.int64), bytes(buffer), offsets[:-1], offsets[1:]
+
+def load_dedup_state(cursor):
+    """Ids and LSH band keys of every row kept by earlier runs"""
+    ids = array('q')
+    band_keys = bytearray()
+
+    cursor.execute('SELECT id, band_keys FROM sentence_dedup ORDER BY id')
+    while True:
+        rows = cursor.fetchmany(FETCH_BATCH_SIZE)
+        if not rows:
+            break
+        for sentence_id, keys in rows:
+            ids.append(sentence_id)
+            band_keys += keys
+
+    band_keys = np.frombuffer(bytes(band_keys), dtype='<u4').astype(np.uint32)
+    return np.frombuffer(ids, dtype=np.int64), band_keys.reshape(-1, LSH_BANDS)
+
+def save_dedup_state(cursor, ids, buffer, starts, ends, band_keys, config):
+    """Record the rows kept by this run and move the watermark"""
+    cursor.executemany('''
+        INSERT INTO sentence_dedup (id, normalized_text, text_hash, band_keys)
+        SELECT ?, ?, text_hash, ? FROM temp_normalized WHERE id = ?
+    ''', (
+        (sentence_id, buffer[start:end].decode(TEXT_ENCODING), keys.astype('<u4').tobytes(), sentence_id)
+        for sentence_id, start, end, keys in zip(ids.tolist(), starts.tolist(), ends.tolist(), band_keys)
+    ))
+
+    cursor.execute(f'SELECT COALESCE(MAX({COLUMN_ID}), 0) FROM {TABLE_NAME}')
+    cursor.executemany('INSERT OR REPLACE INTO dedup_state VALUES (?, ?)', [
+        ('last_deduped_id', cursor.fetchone()[0]),
+        ('last_deduped_at', datetime.now(timezone.utc).isoformat(timespec='seconds')),
+        ('lsh_config', config),
+    ])
 
-    //print("Fetching data...")
-    cursor.execute(f"SELECT {COLUMN_ID}, {COLUMN_TEXT} FROM {TABLE_NAME}")
-    rows = cursor.fetchall()
-    
-    //print(f"Total rows fetched: {len(rows)}")
-
-    # Step 1: Pre-process data
-    # We create a list of dicts to make sorting and accessing easier
-    data = []
-    for r in rows:
-        data.append({
-            'id': r[0],
-            'text': r[1],
-            'clean': normalize_text(r[1])
-        })
-
-    # Step 2: Sort data by the cleaned text
-    # This brings "I love dog" and "I love dogs" next to each other
-    //print("Sorting data for comparison...")
-    data.sort(key=lambda x: x['clean'])
-
-    ids_to_delete = set()
-    
-    # Step 3: Iterate and Compare
-    //print("Scanning for duplicates (this may take time)...")
-    
-    # We use a window approach. We compare current item `i` with the next `WINDOW_SIZE` items.
-    for i in tqdm(range(len(data))):
-        current_row = data[i]
-        
-        # If this row is already marked for deletion, skip it
-        if current_row['id'] in ids_to_delete:
+def cluster_duplicates(matches, protected):
+    """
+    Union-find over matched (i, j, ratio) pairs, keyed by the matched rows
+    only, so the cost is near-linear in the number of pairs (union by size
+    with path halving). Returns {row: root} for every matched row.
+    Rows below index `protected` (already deduped) never end up in the same
+    cluster, so none of them can be merged into another.
+    """
+    parent = {}
+    size = {}
+    has_protected = {}
+
+    def find(k):
+        while parent[k] != k:
+            parent[k] = parent[parent[k]]
+            k = parent[k]
+        return k
+
+    for i, j, _ in matches:
+        for k in (i, j):
+            if k not in parent:
+                parent[k] = k
+                size[k] = 1
+                has_protected[k] = k < protected
+        a, b = find(i), find(j)
+        if a == b or (has_protected[a] and has_protected[b]):
             continue
+        if size[a] < size[b]:
+            a, b = b, a
+        parent[b] = a
+        size[a] += size[b]
+        has_protected[a] = has_protected[a] or has_protected[b]
+    return {k: find(k) for k in parent}
+
+def choose_canonical(compare_ids, lengths, roots, protected):
+    """
+    Canonical row of every cluster with more than one member: an already
+    deduped row if there is one, then the longest normalized text (assuming
+    longer has better punctuation), then the lowest id. Returns {root: row index}.
+    """
+    members = defaultdict(list)
+    for k, root in roots.items():
+        members[root].append(k)
+
+    canonical = {}
+    for root, rows in members.items():
+        if len(rows) > 1:
+            canonical[root] = min(rows, key=lambda k: (k >= protected, -int(lengths[k]), int(compare_ids[k])))
+    return canonical
+
+def resolve_clusters(compare_ids, buffer, starts, ends, matches, protected, splits=None):
+    """
+    Pick the rows to delete from the matched pairs. Union-find only groups
+    rows, and a chain of matches can link rows far less similar than the
+    threshold, so every member is scored against its cluster's canonical
+    row and deleted only if that ratio reaches SIMILARITY_THRESHOLD. Rows
+    that don't are clustered again among themselves, without the rows
+    already settled, until no cluster is left.
+    Returns (decisions as (row, canonical row, ratio to it), cluster count);
+    splits are the pair-mode side splits (see dedup_ratios).
+    """
+    lengths = ends - starts
+    decisions = []
+    clusters = 0
+    while matches:
+        roots = cluster_duplicates(matches, protected)
+        canonical = choose_canonical(compare_ids, lengths, roots, protected)
+        clusters += len(canonical)
+
+        members = np.array([(k, canonical[root]) for k, root in sorted(roots.items())
+                            if root in canonical and canonical[root] != k], dtype=np.int64).reshape(-1, 2)
+        ratios = dedup_ratios(buffer, starts, ends, members, splits)
+        close = ratios >= SIMILARITY_THRESHOLD
+        decisions.extend(zip(members[close, 0].tolist(), members[close, 1].tolist(), ratios[close].tolist()))
+
+        settled = set(members[close, 0].tolist()) | set(canonical.values())
+        matches = [(i, j, ratio) for i, j, ratio in matches if i not in settled and j not in settled]
+    return decisions, clusters
+
+def write_report(cursor, report_path):
+    """One JSON line per row in temp_delete, with the row it duplicates"""
+    cursor.execute(f'''
+        SELECT d.id, d.kept_id, d.reason, d.ratio,
+               deleted.{COLUMN_TEXT}, deleted.{COLUMN_TURKISH}, kept.{COLUMN_TEXT}, kept.{COLUMN_TURKISH}
+        FROM temp_delete d
+        JOIN {TABLE_NAME} deleted ON deleted.{COLUMN_ID} = d.id
+        JOIN {TABLE_NAME} kept ON kept.{COLUMN_ID} = d.kept_id
+        ORDER BY d.id
+    ''')
+    with open(report_path, 'w', encoding='utf-8') as report:
+        for sentence_id, kept_id, reason, ratio, text, turkish, kept_text, kept_turkish in cursor:
+            report.write(json.dumps({
+                'id': sentence_id, 'kept_id': kept_id, 'reason': reason, 'ratio': round(ratio, 4),
+                'text': text, 'turkish': turkish, 'kept_text': kept_text, 'kept_turkish': kept_turkish,
+            }, ensure_ascii=False) + '\n')
+
+def table_exists(cursor, name):
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (name,))
+    return cursor.fetchone() is not None
+
+def delete_duplicates(cursor):
+    """
+    Delete every row in temp_delete with one set-based statement, record
+    where each deleted id now redirects and tombstone its Tatoeba key, drop
+    the deleted rows' FTS entries and the generator's per-sentence rows that
+    point at them, and re-derive its summary tables. The caller commits.
+    """
+    cursor.execute('SELECT COUNT(*) FROM temp_delete')
+    if cursor.fetchone()[0] == 0:
+        return 0
+
+    # External-content FTS5 only forgets a row's terms when told its old
+    # values, so send 'delete' for just these rows before they go
+    if table_exists(cursor, 'sentences_fts'):
+        columns = ', '.join(column[1] for column in cursor.execute('PRAGMA table_info(sentences_fts)').fetchall())
+        cursor.execute(f'''
+            INSERT INTO sentences_fts(sentences_fts, rowid, {columns})
+            SELECT 'delete', {COLUMN_ID}, {columns} FROM {TABLE_NAME}
+            WHERE {COLUMN_ID} IN (SELECT id FROM temp_delete)
+        ''')
 
-        # Check the next few neighbors
-        for j in range(1, WINDOW_SIZE + 1):
-            if i + j >= len(data):
-                break
-            
-            next_row = data[i + j]
-            
-            # Skip if neighbor is already deleted
-            if next_row['id'] in ids_to_delete:
-                continue
-
-            # CRITERIA 1: Exact Match on Normalized Text
-            # Handles: "No pain, no gain" vs "no pain no gain"
-            if current_row['clean'] == next_row['clean']:
-                # Logic: Delete the one with the higher ID (usually the newer one)
-                # Or delete the one that is shorter (assuming longer has better punctuation)
-                if len(current_row['text']) >= len(next_row['text']):
-                    ids_to_delete.add(next_row['id'])
-                else:
-                    ids_to_delete.add(current_row['id'])
-                    break # Current is deleted, stop checking neighbors for it
-
-            # CRITERIA 2: Fuzzy Match
-            # Handles: "dog" vs "dogs", "my books" vs "our books"
-            else:
-                ratio = Levenshtein.ratio(current_row['clean'], next_row['clean'])
-                if ratio >= SIMILARITY_THRESHOLD:
-                    # Found a very similar sentence. 
-                    # We keep the one with the lower ID (original) by default.
-                    //print(f"Match found ({ratio:.2f}):")
-                    //print(f"  KEEP:   {current_row['text']}")
-                    //print(f"  DELETE: {next_row['text']}")
-                    ids_to_delete.add(next_row['id'])
-
-    # Step 4: Execute Deletion
-    count = len(ids_to_delete)
-    if count > 0:
-        //print(f"\nFound {count} duplicates to delete.")
-        user_input = input("Type 'YES' to confirm deletion: ")
-        
-        if user_input == 'YES':
-            //print("Deleting...")
-            # Delete in batches to handle SQLite limits
-            id_list = list(ids_to_delete)
-            batch_size = 900
-            for k in range(0, len(id_list), batch_size):
-                batch = id_list[k:k+batch_size]
-                placeholders = ',' .join('?' * len(batch))
-                cursor.execute(f"DELETE FROM {TABLE_NAME} WHERE {COLUMN_ID} IN ({placeholders})", batch)
-            
-            conn.commit()
-            //print("Deletion complete.")
-            # Optional: Vacuum to reclaim space
-            # cursor.execute("VACUUM") 
-        else:
-            //print("Operation cancelled.")
+    cursor.execute(TOMBSTONES_SCHEMA)
+    cursor.execute(f'''
+        INSERT OR IGNORE INTO sentence_tombstones
+        SELECT turkish_id, english_id FROM {TABLE_NAME} WHERE {COLUMN_ID} IN (SELECT id FROM temp_delete)
+    ''')
+    cursor.execute(f"DELETE FROM {TABLE_NAME} WHERE {COLUMN_ID} IN (SELECT id FROM temp_delete)")
+    deleted = cursor.rowcount
+
+    # New redirects, and older ones whose canonical row was just deleted
+    cursor.execute(REDIRECTS_SCHEMA)
+    cursor.execute('INSERT OR REPLACE INTO sentence_redirects SELECT id, kept_id FROM temp_delete')
+    cursor.execute('''
+        UPDATE sentence_redirects
+        SET canonical_id = (SELECT kept_id FROM temp_delete WHERE id = sentence_redirects.canonical_id)
+        WHERE canonical_id IN (SELECT id FROM temp_delete)
+    ''')
+
+    for table, column in DEPENDENT_TABLES:
+        if table_exists(cursor, table):
+            cursor.execute(f"DELETE FROM {table} WHERE {column} IN (SELECT id FROM temp_delete)")
+    refresh_derived_tables(cursor)
+    return deleted
+
+def refresh_derived_tables(cursor, vocab_db_path=VOCAB_DB_PATH):
+    """
+    Re-derive the generator's per-level counts, shuffle keys and ranked
+    examples after a delete. Shuffle keys are redrawn with the stored seed,
+    so a --reshuffle rotation survives.
+    """
+    if table_exists(cursor, 'sentence_level_stats'):
+        write_level_stats(cursor)
+    if table_exists(cursor, 'sentence_shuffle'):
+        assign_shuffle_keys(cursor, load_shuffle_seed(cursor))
+    if table_exists(cursor, 'word_examples') and os.path.exists(vocab_db_path):
+        create_word_examples(cursor, count_english_tokens(cursor), vocab_db_path)
+
+def reclaim_space(conn):
+    """
+    Incremental vacuum when the database allows it (the generator creates
+    sentences.db with auto_vacuum = INCREMENTAL), otherwise a full VACUUM.
+    Returns which one ran.
+    """
+    auto_vacuum = conn.execute('PRAGMA auto_vacuum').fetchone()[0]
+    if auto_vacuum == 2:
+        conn.execute('PRAGMA incremental_vacuum').fetchall()
+        return 'incremental'
+    conn.execute('VACUUM')
+    return 'full'
+
+def fetch_normalized_texts(cursor, sentence_ids):
+    """Stored normalized text of already-deduped rows, in the order given"""
+    texts = []
+    for sentence_id in sentence_ids:
+        cursor.execute('SELECT normalized_text FROM sentence_dedup WHERE id = ?', (sentence_id,))
+        texts.append(cursor.fetchone()[0])
+    return texts
+
+def clean_database(jobs=None, full=False, apply=False, report_path=REPORT_PATH, vacuum=False, sides='english'):
+    conn = sqlite3.connect(DB_PATH)
+    cursor = conn.cursor()
+    config = f'{LSH_CONFIG}:{sides}'
+
+    # Step 0: Dedup state from earlier runs
+    for statement in DEDUP_SCHEMA:
+        cursor.execute(statement)
+    state = dict(cursor.execute('SELECT key, value FROM dedup_state').fetchall())
+    if state and (full or state.get('lsh_config') != config):
+        print("Discarding saved dedup state" + ("" if full else " (dedup settings changed)"))
+        cursor.execute('DELETE FROM sentence_dedup')
+        cursor.execute('DELETE FROM dedup_state')
+        state = {}
+
+    if state:
+        # Rows deleted since the last run can't match anything any more
+        cursor.execute(f'DELETE FROM sentence_dedup WHERE id NOT IN (SELECT {COLUMN_ID} FROM {TABLE_NAME})')
+        print(f"Incremental run: rows up to id {state['last_deduped_id']} "
+              f"were deduped at {state['last_deduped_at']}")
     else:
-        //print("No duplicates found with current settings.")
+        print("No saved dedup state, comparing every row")
+    existing_ids, existing_keys = load_dedup_state(cursor)
+
+    # Step 1: Exact Match on Normalized Text, in SQL
+    # Handles: "No pain, no gain" vs "no pain no gain"
+    # Keep the longest text of each group (assuming longer has better punctuation)
+    print("Finding exact duplicates...")
+    started = time.perf_counter()
+    groups, exact_count = find_exact_duplicates(conn, sides)
+    print(f"Exact duplicates: {exact_count} in {groups} groups ({time.perf_counter() - started:.2f}s)")
+
+    # Step 2: Stream the remaining unique rows
+    print("Fetching data...")
+    ids, buffer, starts, ends = load_rows(cursor)
+    print(f"Unique rows fetched: {len(ids)} (plus {len(existing_ids)} already deduped)")
+
+    # Step 3: Sort data by the cleaned text
+    # This gives every later step a fixed order
+    print("Sorting data for comparison...")
+    order = sort_texts(buffer, starts, ends)
+    ids, starts, ends = ids[order], starts[order], ends[order]
+
+    # Step 4: Fuzzy Match candidates from MinHash + LSH
+    # Handles: "dog" vs "dogs", "my books" vs "our books", wherever the difference is
+    print("Finding fuzzy duplicate candidates (MinHash + LSH)...")
+    started = time.perf_counter()
+    band_keys = lsh_band_keys(minhash_signatures(buffer, starts, ends))
+    candidates = lsh_candidate_pairs(band_keys)
+    cross_candidates = cross_candidate_pairs(existing_keys, band_keys)
+    print(f"Candidate pairs: {len(candidates):,} among new rows, {len(cross_candidates):,} with deduped rows "
+          f"({time.perf_counter() - started:.2f}s for {len(ids):,} unique texts)")
+
+    # Already-deduped rows that share a bucket with a new row take the first
+    # indexes; cluster_duplicates never lets one of them be replaced
+    matched_existing = np.unique(cross_candidates[:, 0])
+    existing_texts = fetch_normalized_texts(cursor, existing_ids[matched_existing].tolist())
+    existing_buffer = ''.join(existing_texts).encode(TEXT_ENCODING)
+    existing_ends = np.cumsum([len(text) for text in existing_texts], dtype=np.int64)
+
+    offset = len(matched_existing)
+    compare_ids = np.concatenate((existing_ids[matched_existing], ids))
+    compare_starts = np.concatenate((existing_ends - [len(text) for text in existing_texts],
+                                     starts + len(existing_buffer))).astype(np.int64)
+    compare_ends = np.concatenate((existing_ends, ends + len(existing_buffer))).astype(np.int64)
+    pairs = np.concatenate((
+        np.column_stack((np.searchsorted(matched_existing, cross_candidates[:, 0]), cross_candidates[:, 1] + offset)),
+        candidates + offset,
+    ))
+    pairs = pairs[np.lexsort((pairs[:, 1], pairs[:, 0]))]
+
+    # Step 5: Verify candidates
+    # Ratios are computed in parallel and come back in a fixed order, so the
+    # result doesn't depend on --jobs
+    print("Verifying candidates...")
+    started = time.perf_counter()
+    compare_buffer = existing_buffer + buffer
+    matches = verify_candidates(compare_buffer, compare_starts, compare_ends, pairs, jobs, sides)
+    print(f"Verified {len(pairs):,} candidates in {time.perf_counter() - started:.2f}s")
+
+    # Step 6: Cluster matches and keep one canonical row per cluster
+    # Members close enough to it are deleted and redirected to it, wherever they sorted
+    started = time.perf_counter()
+    splits = side_splits(compare_buffer, compare_starts) if sides == 'pair' else None
+    decisions, clusters = resolve_clusters(compare_ids, compare_buffer, compare_starts, compare_ends, matches, offset,
+                                           splits)
+
+    deleted = np.zeros(len(compare_ids), dtype=bool)
+    deleted[[k for k, _, _ in decisions]] = True
+    cursor.executemany('INSERT INTO temp_delete VALUES (?, ?, ?, ?)', [
+        (int(compare_ids[k]), int(compare_ids[kept]), 'fuzzy', ratio) for k, kept, ratio in decisions
+    ])
+
+    # Exact duplicates of a row that just lost its cluster follow it to the
+    # canonical row; their text is the same, so they share its ratio
+    cursor.execute('''
+        UPDATE temp_delete
+        SET (kept_id, ratio) = (SELECT fuzzy.kept_id, fuzzy.ratio FROM temp_delete fuzzy
+                                WHERE fuzzy.id = temp_delete.kept_id)
+        WHERE kept_id IN (SELECT id FROM temp_delete)
+    ''')
+    print(f"Fuzzy duplicates: {len(decisions)} in {clusters} clusters "
+          f"({time.perf_counter() - started:.2f}s)")
+    print(f"Peak memory: {peak_rss_mb():.0f} MB")
+
+    kept = ~deleted[offset:]
+
+    # Step 7: Report, then delete in one transaction
+    count = cursor.execute('SELECT COUNT(*) FROM temp_delete').fetchone()[0]
+    write_report(cursor, report_path)
+    print(f"\nFound {count} duplicates to delete, decisions written to {report_path}")
+
+    if not apply:
+        print("Dry run, nothing deleted (use --apply to delete).")
+        conn.close()
+        return count
+
+    print("Deleting...")
+    started = time.perf_counter()
+    deleted_rows = delete_duplicates(cursor)
+    save_dedup_state(cursor, ids[kept], buffer, starts[kept], ends[kept], band_keys[kept], config)
+    conn.commit()
+    print(f"Deleted {deleted_rows} rows ({time.perf_counter() - started:.2f}s)")
+
+    if vacuum:
+        started = time.perf_counter()
+        mode = reclaim_space(conn)
+        print(f"Reclaimed free pages ({mode} vacuum, {time.perf_counter() - started:.2f}s)")
 
     conn.close()
+    return count
+
+def benchmark_kernel(sample_rows=BENCHMARK_SAMPLE_ROWS, seed=0):
+    """
+    Time edit_ratios against a Levenshtein.ratio loop on real sentences:
+    the candidate pairs that survive LSH and the prefilters, and random pairs.
+    """
+    conn = sqlite3.connect(DB_PATH)
+    texts = [normalize_text(text).encode(TEXT_ENCODING) for (text,) in conn.execute(
+        f'SELECT {COLUMN_TEXT} FROM {TABLE_NAME} ORDER BY RANDOM() LIMIT ?', (sample_rows,))]
+    conn.close()
+    buffer = b''.join(texts)
+    ends = np.cumsum([len(text) for text in texts], dtype=np.int64)
+    starts = ends - np.array([len(text) for text in texts], dtype=np.int64)
+    lengths = ends - starts
+    print(f"Sampled {len(texts):,} sentences: length p50 {np.percentile(lengths, 50):.0f}, "
+          f"p90 {np.percentile(lengths, 90):.0f}, max {lengths.max(initial=0)}, "
+          f"{(lengths <= BITPARALLEL_WORD_BITS).mean() * 100:.1f}% fit one word")
+
+    # Candidate pairs as the dedup stage sees them, after the prefilters
+    _init_verify_worker(buffer, starts, ends)
+    candidates = lsh_candidate_pairs(lsh_band_keys(minhash_signatures(buffer, starts, ends)))
+    first_lengths, second_lengths = lengths[candidates[:, 0]], lengths[candidates[:, 1]]
+    max_distance = (1 - SIMILARITY_THRESHOLD) * (first_lengths + second_lengths) + 1e-9
+    candidates = candidates[np.abs(first_lengths - second_lengths) <= max_distance]
+
+    rng = np.random.default_rng(seed)
+    random_pairs = rng.integers(0, len(texts), size=(len(candidates) or len(texts), 2))
+
+    for name, pairs in [('candidate pairs', candidates), ('random pairs', random_pairs)]:
+        started = time.perf_counter()
+        expected = np.array([Levenshtein.ratio(buffer[starts[i]:ends[i]], buffer[starts[j]:ends[j]],
+                                               score_cutoff=SIMILARITY_THRESHOLD)
+                             for i, j in pairs.tolist()])
+        reference_time = time.perf_counter() - started
+        started = time.perf_counter()
+        ratios = edit_ratios(buffer, starts, ends, pairs, _byte_codes, SIMILARITY_THRESHOLD)
+        kernel_time = time.perf_counter() - started
+        print(f"{name}: {len(pairs):,}")
+        print(f"  Levenshtein.ratio: {reference_time:.3f}s ({len(pairs) / max(reference_time, 1e-9):,.0f} pairs/sec)")
+        print(f"  edit_ratios:       {kernel_time:.3f}s ({len(pairs) / max(kernel_time, 1e-9):,.0f} pairs/sec)")
+        print(f"  identical ratios:  {np.array_equal(expected, ratios)}")
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Remove duplicate and near-duplicate sentences')
+    parser.add_argument('--jobs', type=int, default=None,
+                        help='Worker processes for verifying candidate pairs (default: CPU count)')
+    parser.add_argument('--sides', choices=DEDUP_SIDES, default='english',
+                        help='Dedup on the English text only (default) or on both sides of each pair')
+    parser.add_argument('--full', action='store_true',
+                        help='Ignore the saved dedup state and compare every row')
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument('--dry-run', dest='apply', action='store_false',
+                      help='Only write the decision report (default)')
+    mode.add_argument('--apply', dest='apply', action='store_true',
+                      help='Delete the duplicates and their FTS entries in one transaction')
+    parser.add_argument('--report', default=REPORT_PATH,
+                        help=f'JSONL file for the delete decisions (default: {REPORT_PATH})')
+    parser.add_argument('--vacuum', action='store_true',
+                        help='Reclaim free pages after --apply (incremental vacuum, or a full VACUUM on databases '
+                             'not created with auto_vacuum = INCREMENTAL)')
+    parser.add_argument('--benchmark-kernel', action='store_true',
+                        help='Compare edit_ratios with Levenshtein.ratio on sentences from the database and exit')
+    parser.set_defaults(apply=False)
+    return parser.parse_args()
 
 if __name__ == "__main__":
-    clean_database()
\ No newline at end of file
+    args = parse_args()
+    if args.benchmark_kernel:
+        benchmark_kernel()
+        sys.exit(0)
+    clean_database(jobs=args.jobs, full=args.full, apply=args.apply, report_path=args.report, vacuum=args.vacuum,
+                   sides=args.sides)
@@ -0,0 +1,367 @@
+#!/usr/bin/env python3
+"""
+Layout-aware Oxford 3000 PDF parser - uses word x-positions instead of line regexes.
+Words of every page are grouped into rows, columns and entries in NumPy, and
+the POS list of every entry is found on the word texts' code points, so every
+(word, pos, level) triple is kept, e.g. "account n. B1, v. B2" -> (account, n., B1), (account, v., B2).
+Only the few entries with a bracketed sense go through a per-token state
+machine. On a warm page cache it is at least as fast as parse_oxford_final
+and the only parser with full recall of the golden list (--compare prints both).
+"""
+
+import argparse
+import contextlib
+import csv
+import io
+import re
+import time
+from bisect import bisect_right
+from collections import Counter
+
+import numpy as np
+
+from pdf_pages import extract_page_word_boxes
+
+# A word starts a new column segment when it is the first in its row or
+# follows a gap wider than COLUMN_GAP points; x0 values that start at least
+# COLUMN_MIN_SHARE of the rows are column starts. Wrapped entries continue
+# on an indented line, more than COLUMN_TOLERANCE points right of the start.
+COLUMN_GAP = 8
+COLUMN_MIN_SHARE = 0.25
+COLUMN_TOLERANCE = 3
+# Words whose tops are within ROW_TOLERANCE points share a row
+ROW_TOLERANCE = 1
+# Title, intro and footer rows contain one of these
+FURNITURE_MARKERS = ['Oxford', '©']
+# Pages are grouped together, PAGE_STRIDE points apart; no page is that wide or tall
+PAGE_STRIDE = 10000
+
+LEVEL_PATTERN = re.compile(r'[AB][12]')
+# Split a token into POS and level atoms: "adj.B1," -> adj., B1; "number/det.," -> number, det.
+ATOM_PATTERN = re.compile(r'[AB][12]|[a-z]+\.|[a-z]+')
+# A head token that starts the POS list: "n.", "v.,", "det./pron.", "adj.B1,", "number", "modal" ...
+POS_START_PATTERN = re.compile(
+    r'(?:[a-z]+\.|number|indefinite|definite|auxiliary|modal|infinitive)(?:[.,/]|[AB][12]|$)')
+# Homograph numbers on headwords: "can1" -> "can"
+HOMOGRAPH_PATTERN = re.compile(r'(?<=[a-zA-Z])\d$')
+# Two-word parts of speech, keyed by their first word
+POS_PHRASES = {
+    'indefinite': 'article',
+    'definite': 'article',
+    'auxiliary': 'v.',
+    'modal': 'v.',
+    'infinitive': 'marker',
+}
+POS_ALIASES = {'noun.': 'n.'}
+# POS_START_PATTERN on code points: its bare words, and what may follow a POS or level
+POS_WORDS = {'number', *POS_PHRASES}
+POS_WORD_LENGTHS = sorted({len(word) for word in POS_WORDS})
+NEWLINE = ord('\n')
+# Lookup tables over ASCII; code points past 127 are looked up as 127 (DEL)
+POS_INITIALS = np.isin(np.arange(128), [ord(word[0]) for word in POS_WORDS])
+POS_CLOSERS = np.isin(np.arange(128), [ord(c) for c in '.,/\n'])
+LEVEL_LETTERS = np.isin(np.arange(128), [ord('A'), ord('B')])
+LEVEL_DIGITS = np.isin(np.arange(128), [ord('1'), ord('2')])
+
+OUTPUT_CSV = 'oxford3000_word_pos_levels.csv'
+OUTPUT_FIELDS = ['word', 'pos', 'level', 'sense']
+COMPARE_REPEATS = 5
+
+def document_words(pages):
+    """
+    Words of the whole document: their texts as one string with a newline
+    after every word and as UTF-32 code points, the start and end (newline)
+    offset of each word, float64 boxes and page numbers. Each page is shifted
+    PAGE_STRIDE points right and down from the previous one, so rows and
+    columns of different pages never meet and every page is grouped at once.
+    """
+    text = ''.join([page_text + '\n' for page_text, page_boxes in pages if len(page_boxes)])
+    codes = np.frombuffer(text.encode('utf-32-le'), dtype=np.uint32)
+    ends = np.flatnonzero(codes == NEWLINE)
+    starts = np.r_[0, ends[:-1] + 1]
+    page_ids = np.repeat(np.arange(len(pages)), [len(page_boxes) for _, page_boxes in pages])
+    boxes = np.concatenate([np.zeros((0, 4))] + [page_boxes for _, page_boxes in pages])
+    boxes += (page_ids * PAGE_STRIDE)[:, None]
+    return text, codes, starts, ends, boxes, page_ids
+
+def find_all(text, marker):
+    """Offsets of every occurrence of marker in text"""
+    found = text.find(marker)
+    while found >= 0:
+        yield found
+        found = text.find(marker, found + 1)
+
+def layout_rows(text, ends, boxes):
+    """
+    Word indexes in row order, left to right within a row, and the row number
+    of each. A row holds the words whose tops are within ROW_TOLERANCE points
+    of its topmost word. Title, intro and footer rows span the page and
+    mention Oxford or ©, so they are dropped.
+    """
+    tops = boxes[:, 1]
+    order = np.argsort(tops, kind='stable')
+    sorted_tops = tops[order]
+
+    # Gaps wider than ROW_TOLERANCE always start a row; a run between two such
+    # gaps that spans more than ROW_TOLERANCE is split greedily from its top
+    row_starts = np.ones(len(order), dtype=bool)
+    row_starts[1:] = sorted_tops[1:] > sorted_tops[:-1] + ROW_TOLERANCE
+    runs = np.r_[np.flatnonzero(row_starts), len(order)]
+    wide = np.flatnonzero(sorted_tops[runs[1:] - 1] > sorted_tops[runs[:-1]] + ROW_TOLERANCE)
+    if len(wide):
+        top_list = sorted_tops.tolist()
+        for run in wide.tolist():
+            start, end = runs[run], runs[run + 1]
+            while start < end:
+                row_starts[start] = True
+                start = bisect_right(top_list, top_list[start] + ROW_TOLERANCE, start, end)
+    row_ids = np.empty(len(order), dtype=np.int64)
+    row_ids[order] = np.cumsum(row_starts) - 1
+
+    # One stable sort on row * width + x0 (exact in float64) orders each row
+    # left to right; ties in x0 keep the top order
+    width = np.ceil(boxes[:, 0].max(initial=0)) + 1
+    order = order[np.argsort((row_ids * width + boxes[:, 0])[order], kind='stable')]
+    rows = row_ids[order]
+
+    found = np.array([match for marker in FURNITURE_MARKERS for match in find_all(text, marker)], dtype=np.int64)
+    furniture = np.zeros(len(runs), dtype=bool)
+    furniture[row_ids[np.searchsorted(ends, found)]] = True
+    keep = ~furniture[rows]
+    return order[keep], rows[keep]
+
+def column_starts(rows, x0, x1, pages):
+    """Shifted x0 of every column, from the segment starts shared by many rows of its page"""
+    segment = np.ones(len(rows), dtype=bool)
+    segment[1:] = (rows[1:] != rows[:-1]) | (x0[1:] - x1[:-1] > COLUMN_GAP)
+    values, counts = np.unique(np.round(x0[segment]), return_counts=True)
+    row_first = np.ones(len(rows), dtype=bool)
+    row_first[1:] = rows[1:] != rows[:-1]
+    rows_per_page = np.bincount(pages[row_first])
+    return values[counts >= COLUMN_MIN_SHARE * rows_per_page[(values // PAGE_STRIDE).astype(np.int64)]]
+
+def layout_entries(text, ends, boxes, page_ids):
+    """
+    Word indexes in entry order (page by page, column by column, top to
+    bottom) and whether each word opens an entry. A wrapped entry's indented
+    continuation line is appended to the entry above it.
+    """
+    order, rows = layout_rows(text, ends, boxes)
+    x0, x1, pages = boxes[order, 0], boxes[order, 2], page_ids[order]
+    starts = column_starts(rows, x0, x1, pages)
+    if not len(starts):
+        return order[:0], np.zeros(0, dtype=bool)
+
+    # Words left of their page's first column start are margin notes
+    columns = np.searchsorted(starts, x0 + COLUMN_TOLERANCE, side='right') - 1
+    inside = (columns >= 0) & (starts[columns] // PAGE_STRIDE == pages)
+    order, rows, x0, columns = order[inside], rows[inside], x0[inside], columns[inside]
+
+    # Column by column, a segment is a run of words in one row; it opens an
+    # entry when it starts at the column's x0, or when it is the column's first
+    by_column = np.argsort(columns, kind='stable')
+    order, rows, x0, columns = order[by_column], rows[by_column], x0[by_column], columns[by_column]
+    new_column = np.r_[True, columns[1:] != columns[:-1]]
+    segment = new_column | np.r_[True, rows[1:] != rows[:-1]]
+    return order, segment & (new_column | (np.abs(x0 - starts[columns]) <= COLUMN_TOLERANCE))
+
+def pos_starts(text, codes, starts, ends):
+    """Whether each word matches POS_START_PATTERN, decided on its code points"""
+    codes = np.r_[codes, NEWLINE, NEWLINE]
+
+    def closes(k):
+        """[.,/], [AB][12] or the end of the word at offset k"""
+        here, after = np.minimum(codes[k], 127), np.minimum(codes[k + 1], 127)
+        return POS_CLOSERS[here] | (LEVEL_LETTERS[here] & LEVEL_DIGITS[after])
+
+    # Each word's leading [a-z]+ ends at its first other code point (its newline at the latest)
+    others = np.flatnonzero((codes < ord('a')) | (codes > ord('z')))
+    run_ends = others[np.searchsorted(others, starts)]
+    has_run = run_ends > starts
+    dotted = has_run & (codes[run_ends] == ord('.')) & closes(run_ends + 1)
+    named = (has_run & ~dotted & POS_INITIALS[np.minimum(codes[starts], 127)]
+             & np.isin(run_ends - starts, POS_WORD_LENGTHS) & closes(run_ends))
+    for i in np.flatnonzero(named).tolist():
+        named[i] = text[starts[i]:run_ends[i]] in POS_WORDS
+    return dotted | named
+
+# POS lists repeat thousands of times ("n. A1", "v. B1, n. B2"), so each is split once
+_tail_pairs = {}
+
+def pos_pairs(tail):
+    """[(pos, level), ...] of an entry's POS list; POS without a level are dropped"""
+    pairs, pending = [], []
+    prefix = None
+    for atom in ATOM_PATTERN.findall(tail):
+        if LEVEL_PATTERN.fullmatch(atom):
+            pairs.extend((pos, atom) for pos in pending)
+            pending = []
+        elif prefix:
+            pending.append(f'{prefix} {atom}')
+            prefix = None
+        elif atom in POS_PHRASES:
+            prefix = atom
+        else:
+            pending.append(POS_ALIASES.get(atom, atom))
+    return pairs
+
+def parse_entry(tokens):
+    """
+    State machine over one entry's tokens:
+    head -> (sense) -> pos ... level -> pos ... level.
+    Returns (word, sense, [(pos, level), ...]); POS without a level are dropped.
+    """
+    head, sense = [], []
+    in_sense = False
+    tail = ''
+
+    for i, token in enumerate(tokens):
+        if in_sense:
+            sense.append(token)
+            in_sense = not token.endswith(')')
+        elif head and token.startswith('('):
+            sense.append(token)
+            in_sense = not token.endswith(')')
+        elif head and POS_START_PATTERN.match(token):
+            tail = ' '.join(tokens[i:])
+            break
+        else:
+            head.append(token)
+
+    word = ' '.join(head).strip()
+    if word[-1:].isdigit():
+        word = HOMOGRAPH_PATTERN.sub('', word)
+    pairs = _tail_pairs.get(tail)
+    if pairs is None:
+        pairs = _tail_pairs[tail] = pos_pairs(tail)
+    return word, ' '.join(sense).strip('() '), pairs
+
+def split_entries(text, codes, starts, ends, words, opens):
+    """
+    Words, senses and [(pos, level), ...] lists of every entry. The POS list
+    starts at the first word after the head that matches POS_START_PATTERN;
+    heads and POS lists of all entries are gathered from the document's code
+    points into one string and split apart in one go. The few entries with a
+    word opening a bracketed sense go through parse_entry instead.
+    """
+    if not len(words):
+        return [], [], []
+    entry_starts = np.flatnonzero(opens)
+    entry_ends = np.r_[entry_starts[1:], len(words)]
+    positions = np.where(pos_starts(text, codes, starts, ends)[words] & ~opens, np.arange(len(words)), len(words))
+    tails = np.minimum.reduceat(positions, entry_starts)
+    has_tail = tails < entry_ends
+    last = entry_ends - 1
+
+    # Every word is copied with the code point after it, which becomes a space,
+    # or a newline after the head and after the POS list; entries without a
+    # POS list get one more code point for the newline of an empty one
+    lengths = ends[words] - starts[words] + 1
+    lengths[last[~has_tail]] += 1
+    offsets = np.cumsum(lengths) - lengths
+    parts = np.r_[codes, NEWLINE][np.repeat(starts[words] - offsets, lengths) + np.arange(int(lengths.sum()))]
+    separators = offsets + lengths - 1
+    parts[separators] = ord(' ')
+    parts[separators[last]] = NEWLINE
+    parts[separators[last[~has_tail]] - 1] = NEWLINE
+    parts[separators[tails[has_tail] - 1]] = NEWLINE
+    parts = parts.tobytes().decode('utf-32-le').split('\n')
+    heads, pos_lists = parts[0:-1:2], parts[1::2]
+
+    for tail in set(pos_lists).difference(_tail_pairs):
+        _tail_pairs[tail] = pos_pairs(tail)
+    pairs = list(map(_tail_pairs.__getitem__, pos_lists))
+    senses = [''] * len(heads)
+
+    sensed = np.logical_or.reduceat((codes[starts[words]] == ord('(')) & ~opens, entry_starts)
+    for k in np.flatnonzero(sensed).tolist():
+        heads[k], senses[k], pairs[k] = parse_entry(f'{heads[k]} {pos_lists[k]}'.split())
+
+    # Homograph numbers; non-ASCII code points are checked too, as \d is Unicode
+    head_ends = codes[ends[words[np.where(has_tail, tails - 1, last)]] - 1]
+    numbered = ((head_ends >= ord('0')) & (head_ends <= ord('9'))) | (head_ends > 127)
+    for k in np.flatnonzero(numbered & ~sensed).tolist():
+        if heads[k][-1:].isdigit():
+            heads[k] = HOMOGRAPH_PATTERN.sub('', heads[k])
+    return heads, senses, pairs
+
+def parse_layout(pdf_path):
+    """Every (word, pos, level) triple in the PDF, in page and column order"""
+    text, codes, starts, ends, boxes, page_ids = document_words(extract_page_word_boxes(pdf_path))
+    words, opens = layout_entries(text, ends, boxes, page_ids)
+    return [{'word': word, 'pos': pos, 'level': level, 'sense': sense}
+            for word, sense, word_pairs in zip(*split_entries(text, codes, starts, ends, words, opens))
+            if word and len(word) < 50
+            for pos, level in word_pairs]
+
+def compare_parsers(pdf_path, repeats=COMPARE_REPEATS):
+    """Time each parser on a warm page cache and score it against the golden list"""
+    from benchmark_oxford_parsers import GOLDEN_PATH, load_golden, score
+    from parse_oxford_comprehensive import parse_comprehensive
+    from parse_oxford_final import parse_multicolumn_format
+    from parse_oxford_pdf_full import parse_pdf_with_pdfplumber
+
+    parsers = [
+        ('parse_oxford_pdf_full', parse_pdf_with_pdfplumber),
+        ('parse_oxford_final', parse_multicolumn_format),
+        ('parse_oxford_comprehensive', parse_comprehensive),
+        ('parse_oxford_layout', parse_layout),
+    ]
+
+    golden_levels, golden_triples = load_golden()
+    with contextlib.redirect_stdout(io.StringIO()):
+        parse_layout(pdf_path)  # warms the page cache
+
+    print(f"\n📏 Comparing parsers on {pdf_path} (warm cache, best of {repeats}):")
+    print(f"  Golden list: {len(golden_levels)} words, {len(golden_triples)} triples ({GOLDEN_PATH})")
+    print(f"  {'parser':<28} {'time':>9} {'words':>6} {'recall':>7} {'level':>7} {'triples':>8}")
+    for name, parse in parsers:
+        timings = []
+        for _ in range(repeats):
+            with contextlib.redirect_stdout(io.StringIO()):
+                started = time.perf_counter()
+                result = parse(pdf_path)
+                timings.append(time.perf_counter() - started)
+        scores = score(result, golden_levels, golden_triples)
+        triple_recall = (f"{scores['triple_recall'] * 100:7.1f}%" if scores['triple_recall'] is not None
+                         else f"{'-':>8}")
+        print(f"  {name:<28} {min(timings) * 1000:7.1f}ms {scores['words']:6d} "
+              f"{scores['word_recall'] * 100:6.1f}% {scores['level_recall'] * 100:6.1f}% {triple_recall}")
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Extract (word, pos, level) triples from the Oxford 3000 PDF')
+    parser.add_argument('pdf_path', nargs='?', default='The_Oxford_3000.pdf',
+                        help='PDF to parse (default: The_Oxford_3000.pdf)')
+    parser.add_argument('--output', default=OUTPUT_CSV,
+                        help=f'CSV of word, pos, level, sense rows (default: {OUTPUT_CSV})')
+    parser.add_argument('--compare', action='store_true',
+                        help='Also time every parser and score it against the golden list')
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+
+    print(f"📖 Parsing {args.pdf_path} (column layout)...")
+    started = time.perf_counter()
+    triples = parse_layout(args.pdf_path)
+    elapsed = time.perf_counter() - started
+
+    with open(args.output, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=OUTPUT_FIELDS)
+        writer.writeheader()
+        writer.writerows(triples)
+
+    words = {triple['word'].lower() for triple in triples}
+    print(f"✅ Extracted {len(triples)} (word, pos, level) triples for {len(words)} words in {elapsed:.2f}s")
+    print(f"✅ Saved to {args.output}")
+
+    level_counts = Counter(triple['level'] for triple in triples)
+    print("\n📊 Level distribution (triples):")
+    for level in ['A1', 'A2', 'B1', 'B2']:
+        print(f"  {level}: {level_counts.get(level, 0):4d}")
+
+    if args.compare:
+        compare_parsers(args.pdf_path)
+
+if __name__ == '__main__':
+    main()
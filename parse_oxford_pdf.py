@@ -7,14 +7,8 @@ Outputs a CSV file with word and level columns.
 import re
 import csv
 
-def parse_oxford_pdf_text():
-    """
-    Parse the PDF text content and extract word-level pairs.
-    The PDF format is: word part_of_speech level
-    """
-
-    # PDF content from pages 1-11
-    pdf_text = """
+# PDF content from pages 1-11
+OXFORD_PDF_TEXT = """
     a, an indefinite article A1
     abandon v. B2
     ability n. A2
@@ -375,6 +369,12 @@ def parse_oxford_pdf_text():
     buy v. A1
     by prep. A1, adv. B1
     bye exclam. A1
+"""
+
+def parse_oxford_pdf_text(pdf_text=OXFORD_PDF_TEXT):
+    """
+    Parse the PDF text content and extract word-level pairs.
+    The PDF format is: word part_of_speech level
     """
 
     # More sophisticated regex to handle the format
@@ -406,7 +406,7 @@ def parse_oxford_pdf_text():
     return word_levels
 
 def main():
-    ////print("Parsing Oxford 3000 PDF...")
+    print("Parsing Oxford 3000 PDF...")
     word_levels = parse_oxford_pdf_text()
 
     # Write to CSV
@@ -416,13 +416,13 @@ def main():
         writer.writeheader()
         writer.writerows(word_levels)
 
-    ////print(f"✅ Extracted {len(word_levels)} words with levels")
-    ////print(f"✅ Saved to {output_file}")
+    print(f"✅ Extracted {len(word_levels)} words with levels")
+    print(f"✅ Saved to {output_file}")
 
     # Show sample
-    ////print("\nSample entries:")
+    print("\nSample entries:")
     for item in word_levels[:10]:
-        ////print(f"  {item['word']:<20} → {item['level']}")
+        print(f"  {item['word']:<20} → {item['level']}")
 
 if __name__ == '__main__':
     main()
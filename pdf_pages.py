@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Shared page extraction for the Oxford PDF parsers.
+Page ranges are spread across a process pool; each worker opens the PDF
+itself and results are merged back in page order. Extracted text and word
+boxes are cached in pdf_pages_cache.db, keyed by the PDF's SHA-256 and the
+page number, so re-running a parser only re-runs its regexes.
+"""
+
+import argparse
+import hashlib
+import os
+import sqlite3
+import struct
+import time
+import zlib
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pdfplumber
+
+# Worker processes for page extraction (None = CPU count)
+PAGE_JOBS = None
+
+PAGE_CACHE_PATH = 'pdf_pages_cache.db'
+PAGE_CACHE_SCHEMA = [
+    '''
+    CREATE TABLE IF NOT EXISTS pdf_files (
+        pdf_sha256 TEXT PRIMARY KEY,
+        page_count INTEGER NOT NULL
+    ) WITHOUT ROWID
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS pdf_pages (
+        pdf_sha256 TEXT NOT NULL,
+        page INTEGER NOT NULL,
+        text TEXT NOT NULL,
+        words BLOB NOT NULL,
+        PRIMARY KEY (pdf_sha256, page)
+    ) WITHOUT ROWID
+    ''',
+]
+# Word boxes come back as (text, x0, top, x1, bottom) tuples, or as the
+# newline-joined texts plus an n x 4 array for vectorized callers. They are
+# stored zlib-compressed as the newline-joined word texts followed by
+# float32 x0, top, x1, bottom per word.
+WORD_BOX_FIELDS = ['text', 'x0', 'top', 'x1', 'bottom']
+
+def pdf_sha256(pdf_path):
+    digest = hashlib.sha256()
+    with open(pdf_path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def page_count(pdf_path):
+    with pdfplumber.open(pdf_path) as pdf:
+        return len(pdf.pages)
+
+def split_pages(pages, jobs):
+    """Split a list of page indexes into at most jobs contiguous runs"""
+    size = max(1, -(-len(pages) // max(jobs, 1)))
+    return [pages[start:start + size] for start in range(0, len(pages), size)]
+
+def pack_words(words):
+    texts = '\n'.join(word['text'] for word in words).encode('utf-8')
+    boxes = array('f', [word[field] for word in words for field in WORD_BOX_FIELDS[1:]])
+    return zlib.compress(struct.pack('<I', len(texts)) + texts + boxes.tobytes())
+
+def unpack_words(blob):
+    data = zlib.decompress(blob)
+    size, = struct.unpack_from('<I', data)
+    texts = data[4:4 + size].decode('utf-8').split('\n')
+    boxes = array('f', data[4 + size:]).tolist()
+    return list(zip(texts, boxes[0::4], boxes[1::4], boxes[2::4], boxes[3::4]))
+
+def unpack_word_boxes(blob):
+    """
+    Newline-joined word texts and an (n x 4) float32 array of x0, top, x1,
+    bottom, without a tuple or even a string per word
+    """
+    data = zlib.decompress(blob)
+    size, = struct.unpack_from('<I', data)
+    return data[4:4 + size].decode('utf-8'), np.frombuffer(data, dtype='<f4', offset=4 + size).reshape(-1, 4)
+
+def _extract_pages(pdf_path, pages):
+    """(text, packed word boxes) of the given pages, opened in this worker"""
+    with pdfplumber.open(pdf_path) as pdf:
+        return [(pdf.pages[i].extract_text() or '', pack_words(pdf.pages[i].extract_words())) for i in pages]
+
+def open_page_cache(cache_path=PAGE_CACHE_PATH):
+    conn = sqlite3.connect(cache_path)
+    for statement in PAGE_CACHE_SCHEMA:
+        conn.execute(statement)
+    return conn
+
+def load_pages(pdf_path, jobs=PAGE_JOBS, cache_path=PAGE_CACHE_PATH):
+    """
+    (text, packed word boxes) of every page, in page order.
+    Cached pages are read back from cache_path; only misses go to the
+    worker pool. Pass cache_path=None to skip the cache.
+    """
+    started = time.perf_counter()
+    jobs = jobs or os.cpu_count() or 1
+
+    cached = {}
+    conn = None
+    count = None
+    if cache_path:
+        sha256 = pdf_sha256(pdf_path)
+        conn = open_page_cache(cache_path)
+        row = conn.execute('SELECT page_count FROM pdf_files WHERE pdf_sha256 = ?', (sha256,)).fetchone()
+        count = row[0] if row else None
+        cached = {page: (text, words) for page, text, words in conn.execute(
+            'SELECT page, text, words FROM pdf_pages WHERE pdf_sha256 = ?', (sha256,))}
+    if count is None:
+        count = page_count(pdf_path)
+    missing = [page for page in range(count) if page not in cached]
+
+    runs = split_pages(missing, jobs)
+    if runs:
+        with ProcessPoolExecutor(max_workers=len(runs)) as executor:
+            # map() yields in submission order, so pages line up with their run
+            for run, results in zip(runs, executor.map(_extract_pages, [pdf_path] * len(runs), runs)):
+                cached.update(zip(run, results))
+
+    if conn is not None:
+        conn.execute('INSERT OR REPLACE INTO pdf_files VALUES (?, ?)', (sha256, count))
+        conn.executemany('INSERT OR REPLACE INTO pdf_pages VALUES (?, ?, ?, ?)',
+                         [(sha256, page, *cached[page]) for page in missing])
+        conn.commit()
+        conn.close()
+        print(f"📦 Page cache: {count - len(missing)} hits, {len(missing)} misses ({cache_path})")
+
+    print(f"⏱️  Extracted {count} pages with {len(runs)} workers in {time.perf_counter() - started:.2f}s")
+    return [cached[page] for page in range(count)]
+
+def extract_pages(pdf_path, jobs=PAGE_JOBS, cache_path=PAGE_CACHE_PATH):
+    """(text, word boxes) of every page, in page order"""
+    return [(text, unpack_words(words)) for text, words in load_pages(pdf_path, jobs, cache_path)]
+
+def extract_page_texts(pdf_path, jobs=PAGE_JOBS, cache_path=PAGE_CACHE_PATH):
+    """
+    extract_text() of every page, in page order.
+    Empty pages come back as '' so the list index is the page index.
+    """
+    return [text for text, _ in load_pages(pdf_path, jobs, cache_path)]
+
+def extract_page_word_boxes(pdf_path, jobs=PAGE_JOBS, cache_path=PAGE_CACHE_PATH):
+    """(newline-joined word texts, n x 4 box array) of every page, in page order; see unpack_word_boxes"""
+    return [unpack_word_boxes(words) for _, words in load_pages(pdf_path, jobs, cache_path)]
+
+def invalidate_cache(pdf_path=None, cache_path=PAGE_CACHE_PATH):
+    """Drop the cached pages of pdf_path, or of every PDF when pdf_path is None"""
+    if not os.path.exists(cache_path):
+        return 0
+    conn = open_page_cache(cache_path)
+    if pdf_path:
+        sha256 = pdf_sha256(pdf_path)
+        conn.execute('DELETE FROM pdf_files WHERE pdf_sha256 = ?', (sha256,))
+        deleted = conn.execute('DELETE FROM pdf_pages WHERE pdf_sha256 = ?', (sha256,)).rowcount
+    else:
+        conn.execute('DELETE FROM pdf_files')
+        deleted = conn.execute('DELETE FROM pdf_pages').rowcount
+    conn.commit()
+    conn.execute('VACUUM')
+    conn.close()
+    return deleted
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Extract and cache PDF page text and word boxes')
+    parser.add_argument('pdf_path', nargs='?', default='The_Oxford_3000.pdf',
+                        help='PDF to extract (default: The_Oxford_3000.pdf)')
+    parser.add_argument('--jobs', type=int, default=PAGE_JOBS,
+                        help='Worker processes for pages not in the cache (default: CPU count)')
+    parser.add_argument('--cache', default=PAGE_CACHE_PATH,
+                        help=f'Cache database (default: {PAGE_CACHE_PATH})')
+    parser.add_argument('--invalidate', action='store_true',
+                        help='Drop the cached pages of this PDF before extracting')
+    parser.add_argument('--invalidate-all', action='store_true',
+                        help='Drop every cached page and exit')
+    return parser.parse_args()
+
+if __name__ == '__main__':
+    args = parse_args()
+    if args.invalidate_all:
+        print(f"🗑️  Dropped {invalidate_cache(None, args.cache)} cached pages")
+    else:
+        if args.invalidate:
+            print(f"🗑️  Dropped {invalidate_cache(args.pdf_path, args.cache)} cached pages of {args.pdf_path}")
+        pages = extract_pages(args.pdf_path, args.jobs, args.cache)
+        print(f"✅ {len(pages)} pages, {sum(len(words) for _, words in pages):,} words")
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Dictionary-compressed storage for sentence pairs.
+Trains one zstd dictionary per language on the corpus and writes
+sentences_zstd.db, where each sentence is a small compressed blob.
+"""
+
+import os
+import random
+import sqlite3
+import time
+
+try:
+    import zstandard
+except ImportError:  # optional: only needed for --zstd
+    zstandard = None
+
+ZSTD_DB_PATH = 'sentences_zstd.db'
+ZSTD_LEVEL = 19
+ZSTD_DICT_SIZE = 112 * 1024
+ZSTD_TRAINING_SAMPLES = 100000
+ZSTD_COLUMNS = ['turkish_text', 'english_text']
+
+# Benchmark: the app reads 50 rows at a time
+BENCHMARK_ROWS = 50
+BENCHMARK_READS = 200
+
+ZSTD_SENTENCES_SCHEMA = '''
+    CREATE TABLE sentences (
+        id INTEGER PRIMARY KEY,
+        turkish_id INTEGER,
+        turkish_text BLOB NOT NULL,
+        english_id INTEGER,
+        english_text BLOB NOT NULL,
+        difficulty_level
+    )
+'''
+
+ZSTD_DICTIONARIES_SCHEMA = '''
+    CREATE TABLE zstd_dictionaries (
+        column_name TEXT PRIMARY KEY,
+        dictionary BLOB NOT NULL
+    ) WITHOUT ROWID
+'''
+
+def require_zstandard():
+    if zstandard is None:
+        raise RuntimeError("zstd storage needs the zstandard package (pip3 install zstandard)")
+
+def train_dictionaries(cursor, seed=0):
+    """Train one zstd dictionary per text column from a random sample of sentences"""
+    require_zstandard()
+    cursor.execute('SELECT turkish_text, english_text FROM sentences')
+    rows = cursor.fetchall()
+    sample = random.Random(seed).sample(rows, min(len(rows), ZSTD_TRAINING_SAMPLES))
+
+    dictionaries = {}
+    for i, column in enumerate(ZSTD_COLUMNS):
+        samples = [row[i].encode('utf-8') for row in sample]
+        dictionaries[column] = zstandard.train_dictionary(ZSTD_DICT_SIZE, samples)
+    return dictionaries
+
+def make_compressors(dictionaries):
+    """One compressor per column; content size is kept so blobs decode without a size hint"""
+    return {
+        column: zstandard.ZstdCompressor(level=ZSTD_LEVEL, dict_data=dictionary,
+                                         write_checksum=False, write_dict_id=False)
+        for column, dictionary in dictionaries.items()
+    }
+
+def load_decompressors(conn):
+    """Build per-column decompressors from a sentences_zstd.db connection"""
+    require_zstandard()
+    return {
+        column: zstandard.ZstdDecompressor(dict_data=zstandard.ZstdCompressionDict(dictionary))
+        for column, dictionary in conn.execute('SELECT column_name, dictionary FROM zstd_dictionaries')
+    }
+
+def decode_sentence_rows(rows, decompressors):
+    """Decode (id, turkish_id, turkish_blob, english_id, english_blob, level) rows to text"""
+    turkish = decompressors['turkish_text']
+    english = decompressors['english_text']
+    return [
+        (sentence_id, turkish_id, turkish.decompress(turkish_blob).decode('utf-8'),
+         english_id, english.decompress(english_blob).decode('utf-8'), level)
+        for sentence_id, turkish_id, turkish_blob, english_id, english_blob, level in rows
+    ]
+
+def create_zstd_database(source_path='sentences.db', db_path=ZSTD_DB_PATH):
+    """Write db_path with every sentence of source_path stored as a dictionary-compressed blob"""
+    require_zstandard()
+    print(f"\n🗜️  Creating dictionary-compressed {db_path}...")
+
+    if os.path.exists(db_path):
+        os.remove(db_path)
+
+    source = sqlite3.connect(source_path)
+    source_cursor = source.cursor()
+
+    started = time.perf_counter()
+    dictionaries = train_dictionaries(source_cursor)
+    for column, dictionary in dictionaries.items():
+        print(f"  📖 {column} dictionary: {len(dictionary.as_bytes()) / 1024:.1f} KB")
+    print(f"⏱️  train: {time.perf_counter() - started:.2f}s")
+
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+    cursor.execute(ZSTD_SENTENCES_SCHEMA)
+    cursor.execute(ZSTD_DICTIONARIES_SCHEMA)
+    cursor.executemany('INSERT INTO zstd_dictionaries VALUES (?, ?)',
+                       [(column, dictionary.as_bytes()) for column, dictionary in dictionaries.items()])
+
+    compressors = make_compressors(dictionaries)
+    turkish = compressors['turkish_text']
+    english = compressors['english_text']
+
+    rows_inserted = 0
+    batch_size = 1000
+    insert_started = time.perf_counter()
+
+    source_cursor.execute('''
+        SELECT id, turkish_id, turkish_text, english_id, english_text, difficulty_level
+        FROM sentences ORDER BY id
+    ''')
+    while True:
+        rows = source_cursor.fetchmany(batch_size)
+        if not rows:
+            break
+        batch = [
+            (sentence_id, turkish_id, turkish.compress(turkish_text.encode('utf-8')),
+             english_id, english.compress(english_text.encode('utf-8')), level)
+            for sentence_id, turkish_id, turkish_text, english_id, english_text, level in rows
+        ]
+        cursor.executemany('INSERT INTO sentences VALUES (?, ?, ?, ?, ?, ?)', batch)
+        rows_inserted += len(batch)
+
+        if rows_inserted % 50000 == 0:
+            print(f"  Compressed {rows_inserted:,} sentences...")
+
+    conn.commit()
+    elapsed = time.perf_counter() - insert_started
+    print(f"⏱️  compress: {rows_inserted:,} rows in {elapsed:.2f}s ({rows_inserted / max(elapsed, 1e-9):,.0f} rows/sec)")
+
+    cursor.execute('VACUUM')
+    conn.close()
+    source.close()
+
+    print(f"✅ Compressed database created: {db_path}")
+    return db_path
+
+def _median(values):
+    values = sorted(values)
+    return values[len(values) // 2]
+
+def benchmark_zstd_database(source_path='sentences.db', db_path=ZSTD_DB_PATH, seed=0):
+    """Compare text size and 50-row read latency of plain vs dictionary-compressed storage"""
+    require_zstandard()
+    print(f"\n📏 Benchmarking {db_path} against {source_path}...")
+
+    plain = sqlite3.connect(source_path)
+    packed = sqlite3.connect(db_path)
+    decompressors = load_decompressors(packed)
+
+    plain_bytes = plain.execute(
+        'SELECT SUM(LENGTH(CAST(turkish_text AS BLOB)) + LENGTH(CAST(english_text AS BLOB))) FROM sentences'
+    ).fetchone()[0] or 0
+    packed_bytes = packed.execute(
+        'SELECT SUM(LENGTH(turkish_text) + LENGTH(english_text)) FROM sentences'
+    ).fetchone()[0] or 0
+    dictionary_bytes = packed.execute('SELECT SUM(LENGTH(dictionary)) FROM zstd_dictionaries').fetchone()[0] or 0
+
+    print(f"  Text bytes:   {plain_bytes / (1024 * 1024):8.2f} MB plain")
+    print(f"                {packed_bytes / (1024 * 1024):8.2f} MB compressed "
+          f"(+{dictionary_bytes / 1024:.0f} KB dictionaries, "
+          f"{(1 - (packed_bytes + dictionary_bytes) / max(plain_bytes, 1)) * 100:.1f}% smaller)")
+    print(f"  File size:    {os.path.getsize(source_path) / (1024 * 1024):8.2f} MB {source_path} (includes indexes)")
+    print(f"                {os.path.getsize(db_path) / (1024 * 1024):8.2f} MB {db_path}")
+
+    max_id = packed.execute('SELECT MAX(id) FROM sentences').fetchone()[0] or 0
+    rng = random.Random(seed)
+    starts = [rng.randint(0, max(max_id - BENCHMARK_ROWS, 0)) for _ in range(BENCHMARK_READS)]
+    query = '''
+        SELECT id, turkish_id, turkish_text, english_id, english_text, difficulty_level
+        FROM sentences WHERE id > ? ORDER BY id LIMIT ?
+    '''
+
+    plain_timings = []
+    packed_timings = []
+    decode_timings = []
+    for start in starts:
+        t0 = time.perf_counter()
+        plain.execute(query, (start, BENCHMARK_ROWS)).fetchall()
+        t1 = time.perf_counter()
+        rows = packed.execute(query, (start, BENCHMARK_ROWS)).fetchall()
+        t2 = time.perf_counter()
+        decode_sentence_rows(rows, decompressors)
+        t3 = time.perf_counter()
+        plain_timings.append(t1 - t0)
+        packed_timings.append(t3 - t1)
+        decode_timings.append((t3 - t2) / max(len(rows), 1))
+
+    print(f"  {BENCHMARK_ROWS}-row read (median of {BENCHMARK_READS}):")
+    print(f"    plain      {_median(plain_timings) * 1000:7.3f} ms")
+    print(f"    zstd       {_median(packed_timings) * 1000:7.3f} ms "
+          f"({_median(decode_timings) * 1e6:.2f} µs decode per row)")
+
+    plain.close()
+    packed.close()
+
+if __name__ == '__main__':
+    create_zstd_database()
+    benchmark_zstd_database()
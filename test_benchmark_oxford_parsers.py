@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+"""
+Tests for benchmark_oxford_parsers.py's --baseline regression check.
+Run with: python3 -m pytest test_benchmark_oxford_parsers.py
+"""
+
+from benchmark_oxford_parsers import SPEED_REFERENCE, check_baseline
+
+def report(reference_s, layout_s, layout_recall=1.0):
+    return {
+        'cache': 'warm',
+        'parsers': {
+            SPEED_REFERENCE: {'wall_time_s': reference_s, 'word_recall': 0.9},
+            'parse_oxford_layout': {'wall_time_s': layout_s, 'word_recall': layout_recall},
+        },
+    }
+
+def test_slower_machine_is_not_a_regression():
+    assert check_baseline(report(0.100, 0.090), report(0.010, 0.009)) == []
+
+def test_slowdown_relative_to_reference_fails():
+    failures = check_baseline(report(0.010, 0.030), report(0.010, 0.009))
+    assert len(failures) == 1 and failures[0].startswith('parse_oxford_layout:')
+
+def test_recall_drop_fails_without_reference():
+    baseline = report(0.010, 0.009)
+    run = report(0.010, 0.009, layout_recall=0.5)
+    del run['parsers'][SPEED_REFERENCE]
+    failures = check_baseline(run, baseline)
+    assert failures == [f'{SPEED_REFERENCE}: missing from this run',
+                        'parse_oxford_layout: word_recall 0.5 < baseline 1.0']
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Tests for normalization.py's --apply on small generated databases.
+Run with: python3 -m pytest test_normalization.py
+"""
+
+import csv
+import shutil
+import sqlite3
+
+import numpy as np
+import pytest
+
+import generate_sqlite_databases as generator
+import normalization
+
+VOCABULARY_ROWS = [
+    ('book', 'A1'),
+    ('read', 'A1'),
+    ('house', 'A1'),
+    ('leave', 'A2'),
+    ('rain', 'A2'),
+    ('umbrella', 'B1'),
+]
+
+# (turkish_id, turkish_text, english_id, english_text)
+SENTENCE_PAIRS = [
+    (1, 'Kitabı oku.', 101, 'Read the book.'),
+    (2, 'Kitabı okuyun.', 102, 'Read the book!'),
+    (3, 'Yarın şemsiyeyi ve kitabı evde bırakacağım.', 103, 'I will leave the book and the umbrella at home tomorrow.'),
+    (4, 'Evden çıkmadan önce şemsiyeni al.', 104, 'Take your umbrella before you leave the house.'),
+    (5, 'Yağmur yağıyor.', 105, 'It is raining.'),
+    (6, 'Yağmur yağıyordu.', 106, 'It is raining!'),
+    # Same English, different Turkish: distinct translations in --sides pair
+    (7, 'Evet.', 107, 'I think that we should leave the house before it starts raining.'),
+    (8, 'Hayır!', 108, 'I think that we should leave the house before it starts raining.'),
+    (9, 'Kitap okuyor.', 109, 'He is reading a book.'),
+    (10, 'O bir kitap okuyor.', 110, 'He is reading a book.'),
+    # Duplicates on both sides: exact, and fuzzy
+    (11, 'Kitabı oku!', 111, 'Read the book.'),
+    (12, 'Kitap okuyor.', 112, 'He was reading a book.'),
+]
+
+def write_sources(pairs):
+    with open(generator.VOCABULARY_CSV, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['word', 'level', 'definition', 'turkish_translation', 'example_sentence',
+                         'part_of_speech', 'related_forms', 'synonyms', 'antonyms', 'collocations'])
+        for word, level in VOCABULARY_ROWS:
+            writer.writerow([word, level, '', '', '', 'noun', '', '', '', ''])
+    with open(generator.TSV_FILENAME, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f, delimiter='\t')
+        writer.writerow(['turkish_id', 'turkish_text', 'english_id', 'english_text'])
+        writer.writerows(pairs)
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    """vocabulary.db and sentences.db built from SENTENCE_PAIRS in a temp directory"""
+    monkeypatch.chdir(tmp_path)
+    write_sources(SENTENCE_PAIRS)
+    generator.create_vocabulary_database()
+    generator.create_sentences_database(generator.TSV_FILENAME, jobs=1)
+    return tmp_path
+
+def apply_dedup(db_path, sides='english'):
+    """Run normalization.py --apply on db_path"""
+    original = normalization.DB_PATH
+    normalization.DB_PATH = str(db_path)
+    try:
+        return normalization.clean_database(jobs=1, apply=True, report_path='dedup_report.jsonl', sides=sides)
+    finally:
+        normalization.DB_PATH = original
+
+def fetch(db_path, query, params=()):
+    conn = sqlite3.connect(db_path)
+    rows = conn.execute(query, params).fetchall()
+    conn.close()
+    return rows
+
+def test_apply_on_compact_database_ranks_examples_by_level(workdir):
+    shutil.copy('sentences.db', 'compact.db')
+    generator.compact_sentences_database('compact.db')
+
+    assert apply_dedup(workdir / 'sentences.db') > 0
+    assert apply_dedup(workdir / 'compact.db') > 0
+
+    query = 'SELECT vocab_id, rank, sentence_id FROM word_examples ORDER BY vocab_id, rank'
+    assert fetch('compact.db', query) == fetch('sentences.db', query)
+    assert fetch('compact.db', 'SELECT DISTINCT typeof(difficulty_level) FROM sentence_shuffle') == [('integer',)]
+
+def test_incremental_update_drops_redirects_to_deleted_rows(workdir):
+    apply_dedup(workdir / 'sentences.db')
+    redirects = fetch('sentences.db', 'SELECT old_id, canonical_id FROM sentence_redirects')
+    assert (2, 1) in redirects
+
+    # The next dump no longer has the canonical row of the "Read the book" cluster
+    write_sources([pair for pair in SENTENCE_PAIRS if pair[0] != 1])
+    assert generator.update_sentences_database(generator.TSV_FILENAME, jobs=1)
+
+    assert fetch('sentences.db', 'SELECT id FROM sentences WHERE id = 1') == []
+    assert fetch('sentences.db', '''
+        SELECT old_id FROM sentence_redirects
+        WHERE canonical_id NOT IN (SELECT id FROM sentences)
+    ''') == []
+
+def test_pair_mode_keeps_different_translations_of_the_same_english(workdir):
+    # 11 repeats 1 exactly; 5 / 6 and 9 / 12 are close on both sides
+    assert apply_dedup(workdir / 'sentences.db', sides='pair') == 3
+
+    pairs = set(fetch('sentences.db', 'SELECT english_text, turkish_text FROM sentences'))
+    raining = 'I think that we should leave the house before it starts raining.'
+    assert {(raining, 'Evet.'), (raining, 'Hayır!')} <= pairs
+    assert ('He is reading a book.', 'O bir kitap okuyor.') in pairs
+    assert fetch('sentences.db', 'SELECT turkish_id FROM sentences WHERE turkish_id IN (11, 9, 12)') in ([(9,)], [(12,)])
+
+def test_edit_ratios_with_threshold_match_levenshtein_score_cutoff(monkeypatch):
+    texts = [english for _, _, _, english in SENTENCE_PAIRS] + ['x' * 80, 'x' * 79 + 'y', '']
+    buffer = ''.join(texts).encode('utf-8')
+    lengths = [len(text.encode('utf-8')) for text in texts]
+    ends = np.cumsum(lengths)
+    starts = ends - lengths
+    pairs = np.array([(i, j) for i in range(len(texts)) for j in range(len(texts))])
+    expected = [normalization.Levenshtein.ratio(buffer[starts[i]:ends[i]], buffer[starts[j]:ends[j]],
+                                                score_cutoff=normalization.SIMILARITY_THRESHOLD)
+                for i, j in pairs.tolist()]
+
+    ratios = normalization.edit_ratios(buffer, starts, ends, pairs, threshold=normalization.SIMILARITY_THRESHOLD)
+    assert ratios == pytest.approx(expected)
+
+    # NumPy < 2 has no bitwise_count
+    monkeypatch.delattr(normalization.np, 'bitwise_count', raising=False)
+    ratios = normalization.edit_ratios(buffer, starts, ends, pairs, threshold=normalization.SIMILARITY_THRESHOLD)
+    assert ratios == pytest.approx(expected)
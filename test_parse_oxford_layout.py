@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Tests for parse_oxford_layout.py's NumPy entry split against its per-token state machine.
+Run with: python3 -m pytest test_parse_oxford_layout.py
+"""
+
+import numpy as np
+
+import parse_oxford_layout as layout
+
+ENTRIES = [
+    'account n. B1, v. B2',
+    'a, an indefinite article A1',
+    'can1 modal v. A1',
+    'bank (money) n. A1',
+    'last1 (taking time) v. A2',
+    'number n. A1, number det./pron. A2',
+    'adj.B1, adv. A2',
+    'ice cream n. A1',
+    'café n. A2',
+    'no level here',
+    'numbers.',
+    'be auxiliary v. A1',
+]
+
+def split(entries):
+    """split_entries on a one-page document holding the given entry lines"""
+    tokens = [line.split(' ') for line in entries]
+    text = '\n'.join(token for line in tokens for token in line)
+    boxes = np.zeros((sum(map(len, tokens)), 4), dtype=np.float32)
+    text, codes, starts, ends, boxes, page_ids = layout.document_words([(text, boxes)])
+    opens = np.array([i == 0 for line in tokens for i in range(len(line))])
+    return layout.split_entries(text, codes, starts, ends, np.arange(len(opens)), opens)
+
+def test_split_entries_matches_parse_entry():
+    heads, senses, pairs = split(ENTRIES)
+    assert list(zip(heads, senses, pairs)) == [layout.parse_entry(line.split(' ')) for line in ENTRIES]
+    assert heads[2] == 'can' and pairs[2] == [('modal v.', 'A1')]
+
+def test_pos_starts_matches_pattern():
+    words = [token for line in ENTRIES for token in line.split(' ')] + ['definite', 'n.,', 'v.B', 'modal,', 'modals']
+    text, codes, starts, ends, _, _ = layout.document_words([('\n'.join(words), np.zeros((len(words), 4)))])
+    expected = [bool(layout.POS_START_PATTERN.match(word)) for word in words]
+    assert layout.pos_starts(text, codes, starts, ends).tolist() == expected